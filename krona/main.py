@@ -1,14 +1,18 @@
 import argparse
+import sys
 from pathlib import Path
 
+from krona.models.transaction import Transaction
 from krona.parsers.avanza import AvanzaParser
+from krona.parsers.base import BaseParser
 from krona.parsers.nordnet import NordnetParser
 from krona.processor.transaction import TransactionProcessor
-from krona.ui.cli import CLI
-from krona.ui.tui_wrapper import TUIWrapper
-from krona.utils.io import identify_broker_files, read_transactions_from_files
+from krona.utils.io import DEFAULT_PLAN_CACHE_FILE, read_broker_transactions
 
-DEBUG_SYMBOLS = {}
+DEBUG_SYMBOLS: frozenset[str] = frozenset()
+
+# Parsers are stateless, so one shared instance of each serves every run
+PARSERS: tuple[BaseParser, ...] = (NordnetParser(), AvanzaParser())
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -35,27 +39,51 @@ def parse_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _add_transactions_debug(processor: TransactionProcessor, transactions: list[Transaction]) -> None:
+    """Process transactions one at a time, printing the position after each DEBUG_SYMBOLS transaction.
+
+    Output is collected while processing and written once at the end.
+    """
+    debug_out: list[str] = []
+    add_transaction = processor.add_transaction
+    positions_get = processor.positions.get
+    for transaction in transactions:
+        add_transaction(transaction)
+        if transaction.canonical_symbol in DEBUG_SYMBOLS:
+            # New positions are renamed to their canonical symbol, so fall back to that key
+            position = positions_get(transaction.symbol) or positions_get(transaction.canonical_symbol)
+            debug_out.append(f"{transaction}\n{position}")
+    if debug_out:
+        sys.stdout.write("\n".join(debug_out) + "\n")
+
+
 def main(path: Path, ui_mode: str = "tui"):
     """Main function to process transaction files."""
     processor = TransactionProcessor()
-    nordnet_parser = NordnetParser()
-    avanza_parser = AvanzaParser()
 
-    broker_files = identify_broker_files(path, [nordnet_parser, avanza_parser])
-    transactions = read_transactions_from_files(broker_files, [nordnet_parser, avanza_parser])
+    transactions = read_broker_transactions(path, PARSERS)
 
     print(f"Found {len(transactions)} transactions")
 
     # Phase 1: Create mapping plan
     print("\nCreating mapping plan...")
     # Handle existing mapping configuration based on UI mode
+    # Only import the UI that is used; the TUI pulls in Textual and the CLI Rich
     if ui_mode == "cli":
+        from krona.ui.cli import CLI
+
         existing_plan = CLI.prompt_load_existing_config()
-        plan = existing_plan if existing_plan else processor.mapper.create_mapping_plan(transactions)
+        plan = (
+            existing_plan
+            if existing_plan
+            else processor.mapper.create_mapping_plan(transactions, cache_file=DEFAULT_PLAN_CACHE_FILE)
+        )
         ui = CLI(plan)
     elif ui_mode == "tui":
+        from krona.ui.tui_wrapper import TUIWrapper
+
         # For TUI, load existing config silently and let TUI handle the display
-        plan = processor.mapper.create_mapping_plan(transactions)
+        plan = processor.mapper.create_mapping_plan(transactions, cache_file=DEFAULT_PLAN_CACHE_FILE)
         ui = TUIWrapper(plan, suggestions=[], processor=processor, transactions=transactions)
     else:
         raise ValueError(f"Unknown UI mode: {ui_mode}")
@@ -67,22 +95,19 @@ def main(path: Path, ui_mode: str = "tui"):
         # Accept the plan and process transactions
         processor.mapper.accept_plan(plan)
         processor.clear_positions()
-        for transaction in transactions:
-            processor.add_transaction(transaction)
-            if DEBUG_SYMBOLS is not None and transaction.symbol in DEBUG_SYMBOLS:
-                print(transaction)
-                print(processor.positions.get(transaction.symbol))
+        if DEBUG_SYMBOLS:
+            _add_transactions_debug(processor, transactions)
+        else:
+            processor.add_transactions(transactions)
 
-        positions = list(processor.positions.values())
         # Show interactive positions view
         if isinstance(ui, CLI):
             # Re-initialize CLI with processor and transactions to allow future reuse if needed
             ui = CLI(plan=plan, processor=processor, transactions=transactions)
-            ui.run_positions_view(positions)
+            ui.run_positions_view(processor.positions.values())
         else:
             # Fallback to simple display if not CLI instance
-            print("\n📊 Portfolio Summary:")
-            print(f"Total Positions: {len(positions)}")
+            print(f"\n📊 Portfolio Summary:\nTotal Positions: {len(processor.positions)}")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
+from fractions import Fraction
 
 
 class ActionType(Enum):
     SPLIT = "SPLIT"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Action:
     date: date
     type: ActionType
@@ -15,4 +16,4 @@ class Action:
     new_symbol: str
     old_ISIN: str
     new_ISIN: str
-    ratio: float
+    ratio: Fraction
@@ -6,29 +6,29 @@ from typing import Any
 from krona.models.suggestion import Suggestion, SuggestionStatus
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolGroup:
     """Represents a group of symbols and ISINs that map to a canonical symbol."""
 
     canonical_symbol: str
-    synonyms: list[str] = field(default_factory=list)
-    isins: list[str] = field(default_factory=list)
+    synonyms: set[str] = field(default_factory=set)
+    isins: set[str] = field(default_factory=set)
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for YAML serialization."""
-        return {"synonyms": self.synonyms, "ISINs": self.isins}
+        return {"synonyms": sorted(self.synonyms), "ISINs": sorted(self.isins)}
 
     @classmethod
     def from_dict(cls, canonical_symbol: str, data: dict[str, Any]) -> SymbolGroup:
         """Create from dictionary for YAML deserialization."""
         return cls(
             canonical_symbol=canonical_symbol,
-            synonyms=data.get("synonyms", []),
-            isins=data.get("ISINs", []),
+            synonyms=set(data.get("synonyms") or []),
+            isins=set(data.get("ISINs") or []),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MappingPlan:
     """Represents a mapping plan with all symbol and ISIN mappings."""
 
@@ -36,6 +36,11 @@ class MappingPlan:
     isin_mappings: dict[str, str]  # isin -> canonical_symbol
     suggestions: list[Suggestion]  # unresolved conflicts that need user input
 
+    @property
+    def non_identical_symbol_mappings(self) -> dict[str, str]:
+        """Symbol mappings whose source differs from its canonical symbol."""
+        return {source: target for source, target in self.symbol_mappings.items() if source != target}
+
     @property
     def accepted_suggestions(self) -> list[Suggestion]:
         return [s for s in self.suggestions if s.status == SuggestionStatus.ACCEPTED]
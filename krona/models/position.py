@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass
 
-from krona.models.transaction import Transaction, TransactionType
+from krona.models.transaction import Transaction
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a single position with minimal logic"""
 
@@ -18,7 +19,11 @@ class Position:
     fees: float
 
     transactions: list[Transaction]
-    transaction_buffer: list[Transaction] = field(default_factory=list)
+    # First leg of a split, held until its counterpart arrives
+    pending_split: Transaction | None = None
+    # Running totals of every BUY/SELL applied, so realized profit doesn't rescan the transactions
+    total_bought: float = 0.0
+    total_sold: float = 0.0
 
     @property
     def cost_basis(self) -> float:
@@ -31,9 +36,7 @@ class Position:
     @property
     def realized_profit(self) -> float | None:
         if self.is_closed:
-            total_bought = sum([t.total_amount for t in self.transactions if t.transaction_type == TransactionType.BUY])
-            total_sold = sum([t.total_amount for t in self.transactions if t.transaction_type == TransactionType.SELL])
-            return total_sold - total_bought + self.dividends - self.fees
+            return self.total_sold - self.total_bought + self.dividends - self.fees
         else:
             return None
 
@@ -41,10 +44,13 @@ class Position:
         # Handle very small quantities to avoid scientific notation
         quantity_str = f"{self.quantity:.1f}" if self.quantity % 1 != 0 else f"{int(self.quantity)}"
 
+        summary = (
+            f"{self.symbol} ({self.ISIN}): {self.cost_basis:.2f} {self.currency} ({quantity_str} @ {self.price:.2f}) "
+            f"Dividends: {self.dividends:.2f}. Fees: {self.fees:.2f}"
+        )
         if self.is_closed:
-            return f"--CLOSED--{self.symbol} ({self.ISIN}): {self.cost_basis:.2f} {self.currency} ({quantity_str} @ {self.price:.2f}) Dividends: {self.dividends:.2f}. Fees: {self.fees:.2f}. Realized profit: {self.realized_profit:.2f}"
-        else:
-            return f"{self.symbol} ({self.ISIN}): {self.cost_basis:.2f} {self.currency} ({quantity_str} @ {self.price:.2f}) Dividends: {self.dividends:.2f}. Fees: {self.fees:.2f}"
+            return f"--CLOSED--{summary}. Realized profit: {self.realized_profit:.2f}"
+        return summary
 
     @classmethod
     def new(cls, transaction: Transaction) -> Position:
@@ -58,3 +64,26 @@ class Position:
             fees=0,
             transactions=[],
         )
+
+
+@dataclass(slots=True)
+class PortfolioSummary:
+    """Aggregate figures over a set of positions"""
+
+    open_positions: int = 0
+    closed_positions: int = 0
+    total_value: float = 0.0
+    total_dividends: float = 0.0
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Position]) -> PortfolioSummary:
+        """Aggregate the positions in a single pass."""
+        summary = cls()
+        for position in positions:
+            summary.total_dividends += position.dividends
+            if position.is_closed:
+                summary.closed_positions += 1
+            else:
+                summary.open_positions += 1
+                summary.total_value += position.cost_basis
+        return summary
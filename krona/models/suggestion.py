@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from krona.models.mapping import MappingPlan
@@ -14,7 +14,12 @@ class SuggestionStatus(Enum):
     DECLINED = "declined"
 
 
-@dataclass
+class SuggestionKind(Enum):
+    ISIN_CHANGE = "isin_change"  # Symbols with different ISINs, e.g. after a split or merger
+    NAME_MATCH = "name_match"  # Same or unknown ISIN, only the names differ
+
+
+@dataclass(slots=True)
 class Suggestion:
     """Represents a mapping suggestion for user review."""
 
@@ -25,19 +30,50 @@ class Suggestion:
     status: SuggestionStatus = SuggestionStatus.PENDING
     source_isin: str | None = field(default=None)
     target_isin: str | None = field(default=None)
+    # Classified once from the ISINs, so renders don't re-compare them
+    kind: SuggestionKind = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.source_isin and self.target_isin and self.source_isin != self.target_isin:
+            self.kind = SuggestionKind.ISIN_CHANGE
+        else:
+            self.kind = SuggestionKind.NAME_MATCH
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for YAML serialization."""
+        return {
+            "source_symbol": self.source_symbol,
+            "target_symbol": self.target_symbol,
+            "confidence": self.confidence,
+            "rationale": self.rationale,
+            "status": self.status.value,
+            "source_isin": self.source_isin,
+            "target_isin": self.target_isin,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Suggestion:
+        """Create from dictionary for YAML deserialization."""
+        return cls(
+            source_symbol=data["source_symbol"],
+            target_symbol=data["target_symbol"],
+            confidence=data.get("confidence"),
+            rationale=data.get("rationale", ""),
+            status=SuggestionStatus(data.get("status", SuggestionStatus.PENDING.value)),
+            source_isin=data.get("source_isin"),
+            target_isin=data.get("target_isin"),
+        )
 
     @classmethod
     def from_mapping_plan(cls, plan: MappingPlan) -> list[Suggestion]:
         """Convert a MappingPlan to a list of suggestions."""
-        suggestions = []
-        for source, target in plan.symbol_mappings.items():
-            suggestions.append(
-                cls(
-                    source_symbol=source,
-                    target_symbol=target,
-                    confidence=None,
-                    rationale="Loaded from config",
-                    status=SuggestionStatus.ACCEPTED,
-                )
+        return [
+            cls(
+                source_symbol=source,
+                target_symbol=target,
+                confidence=None,
+                rationale="Loaded from config",
+                status=SuggestionStatus.ACCEPTED,
             )
-        return suggestions
+            for source, target in plan.symbol_mappings.items()
+        ]
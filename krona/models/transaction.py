@@ -4,7 +4,7 @@ Represents a single transaction, immutable and with minimal logic that's intrins
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from enum import Enum
 
@@ -29,15 +29,28 @@ class TransactionType(Enum):
         """Convert any recognized term to a TransactionType."""
         term = term.strip().lower()
 
-        for type_name, synonyms in SYNONYMS.items():
-            # TODO: make SYNONYMS better
-            if term in [synonym.strip().lower() for synonym in synonyms]:
-                return cls[type_name]
+        try:
+            return TRANSACTION_TERMS[term]
+        except KeyError:
+            raise ValueError(f"Unknown transaction type: '{term}'. Valid terms are: {VALID_TERMS}") from None
 
-        raise ValueError(f"Unknown transaction type: '{term}'. Valid terms are: {SYNONYMS.values()}")
+
+# Normalized term -> TransactionType, built once so from_term is a single dict probe
+TRANSACTION_TERMS: dict[str, TransactionType] = {
+    synonym.strip().lower(): TransactionType[type_name]
+    for type_name, synonyms in SYNONYMS.items()
+    for synonym in synonyms
+}
+# Members in a fixed order and normalized term -> index, so parsers can classify a whole column into integer codes
+TRANSACTION_TYPES: tuple[TransactionType, ...] = tuple(TransactionType)
+TRANSACTION_TERM_CODES: dict[str, int] = {
+    term: TRANSACTION_TYPES.index(transaction_type) for term, transaction_type in TRANSACTION_TERMS.items()
+}
+# Listed in from_term's error, which the parsers hit on every row of an unsupported type
+VALID_TERMS = ", ".join(sorted(TRANSACTION_TERMS))
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Represents a single transaction, immutable and with minimal logic"""
 
@@ -49,6 +62,10 @@ class Transaction:
     quantity: int
     price: float
     fees: float
+    # Canonical symbol resolved by the mapper, cached so later lookups are a field load
+    canonical_symbol: str | None = field(default=None, compare=False, repr=False)
+    # Generation of the mapper mappings canonical_symbol was resolved under, so it is resolved again after they change
+    canonical_generation: int = field(default=-1, compare=False, repr=False)
 
     @property
     def total_amount(self) -> float:
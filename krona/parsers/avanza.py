@@ -1,8 +1,10 @@
+import sys
 from collections.abc import Iterator
+from datetime import date
 
 import polars as pl
 
-from krona.models.transaction import Transaction, TransactionType
+from krona.models.transaction import TRANSACTION_TERM_CODES, TRANSACTION_TYPES, Transaction, TransactionType
 from krona.parsers.base import BaseParser
 
 schema = pl.Schema(
@@ -23,65 +25,91 @@ schema = pl.Schema(
     }
 )
 
+SCHEMA_FIELDSET = frozenset(schema.names())
+
+# Rank of each known term in alphabetical order. Sorting on it orders a day's rows like sorting on the term text
+# did (köp before sälj), but compares small integers instead of strings
+TERM_SORT_RANKS: dict[str, int] = {term: rank for rank, term in enumerate(sorted(TRANSACTION_TERM_CODES))}
+BUY_CODE = TRANSACTION_TYPES.index(TransactionType.BUY)
+SELL_CODE = TRANSACTION_TYPES.index(TransactionType.SELL)
+
 
 class AvanzaParser(BaseParser):
     name = "avanza"
 
     def is_valid_file(self, file_path: str) -> bool:
         try:
-            df = pl.read_csv(file_path, separator=";", encoding="utf-8-sig", decimal_comma=True, schema=schema)
-            return set(schema.names()).issubset(set(df.columns))
-        except UnicodeDecodeError:
+            # Only the header is needed to recognise the export; parse_file reads the rows
+            columns = pl.scan_csv(file_path, separator=";", encoding="utf8", n_rows=0).collect_schema().names()
+            return SCHEMA_FIELDSET.issubset(columns)
+        except (UnicodeDecodeError, pl.exceptions.PolarsError):
             return False
 
     def parse_file(self, file_path: str, skip_unknown_types: bool = True) -> Iterator[Transaction]:
         if not self.is_valid_file(file_path):
             return
 
-        df = (
-            pl.read_csv(
+        term = pl.col("Typ av transaktion").str.strip_chars().str.to_lowercase()
+        lf = (
+            pl.scan_csv(
                 file_path,
                 separator=";",
-                encoding="utf-8-sig",
+                encoding="utf8",  # Polars strips the BOM itself and memory-maps utf8 files
                 decimal_comma=True,
                 schema=schema,
             )
-            .sort(by=["Datum", "Typ av transaktion"])  # Ensure that we process buys before sells on the same day
             .with_columns(
-                pl.when(pl.col("Valutakurs").is_null()).then(1.0).otherwise(pl.col("Valutakurs")).alias("Valutakurs"),
-                pl.when(pl.col("Kurs").is_null()).then(0.0).otherwise(pl.col("Kurs")).alias("Kurs"),
-                pl.when(pl.col("Courtage (SEK)").is_null())
-                .then(0.0)
-                .otherwise(pl.col("Courtage (SEK)"))
-                .alias("Courtage (SEK)"),
+                pl.col("Valutakurs").fill_null(1.0),
+                pl.col("Kurs").fill_null(0.0),
+                pl.col("Courtage (SEK)").fill_null(0.0),
+                # Classify every row up front; unknown terms come out as null
+                term.replace_strict(TRANSACTION_TERM_CODES, default=None, return_dtype=pl.Int8).alias("type"),
+                term.replace_strict(TERM_SORT_RANKS, default=None, return_dtype=pl.Int8).alias("term_rank"),
             )
+            .sort(by=["Datum", "term_rank"])  # Ensure that we process buys before sells on the same day
         )
+        if not skip_unknown_types:
+            unknown_terms = (
+                lf.filter(pl.col("type").is_null()).select("Typ av transaktion").drop_nulls().head(1).collect()
+            )
+            if unknown_terms.height:
+                TransactionType.from_term(unknown_terms.item())  # Raises the usual ValueError
 
-        for row in df.iter_rows(named=True):
-            try:
-                transaction_type = TransactionType.from_term(row["Typ av transaktion"])
-                if transaction_type == TransactionType.SELL and row["Antal"] > 0:
-                    # This is a correction from avanza that removes an erraneous SELL transaction.
-                    # We put it as BUY so that they cancel each other out.
-                    transaction_type = TransactionType.BUY
-                if row["Värdepapper/beskrivning"] == "INVESTOR B" and row["Datum"].strftime("%Y-%m-%d") == "2016-11-01":
-                    continue
-                yield Transaction(
-                    date=row["Datum"],
-                    symbol=row["Värdepapper/beskrivning"],
-                    transaction_type=transaction_type,
-                    currency=row["Transaktionsvaluta"],
-                    ISIN=row["ISIN"],
-                    quantity=abs(row["Antal"]),
-                    price=abs(row["Valutakurs"] * row["Kurs"]),
-                    fees=abs(row["Courtage (SEK)"]),
-                )
-            except ValueError:
-                if skip_unknown_types:
-                    # logger.warning("Unknown transaction type, skipping:\n %s", row)
-                    continue
-                else:
-                    raise
-            except TypeError:
-                # logger.warning("Unknown transaction type, skipping:\n %s", row)
-                continue
+        rows = (
+            lf.filter(
+                pl.col("type").is_not_null(),
+                pl.col("Antal").is_not_null(),
+                ~(
+                    (pl.col("Värdepapper/beskrivning") == "INVESTOR B") & (pl.col("Datum") == date(2016, 11, 1))
+                ).fill_null(False),
+            )
+            .select(
+                "Datum",
+                "Värdepapper/beskrivning",
+                # A SELL with positive quantity is a correction from avanza that removes an erraneous SELL transaction.
+                # We put it as BUY so that they cancel each other out.
+                pl.when((pl.col("type") == SELL_CODE) & (pl.col("Antal") > 0))
+                .then(pl.lit(BUY_CODE, dtype=pl.Int8))
+                .otherwise(pl.col("type"))
+                .alias("type"),
+                "Transaktionsvaluta",
+                "ISIN",
+                pl.col("Antal").abs(),
+                (pl.col("Valutakurs") * pl.col("Kurs")).abs().alias("Kurs"),
+                pl.col("Courtage (SEK)").abs(),
+            )
+            .collect()
+            .iter_rows()
+        )
+        for row_date, symbol, type_code, currency, isin, quantity, price, fees in rows:
+            yield Transaction(
+                date=row_date,
+                # Interned so string comparisons and dict probes downstream hit the identity fast path
+                symbol=sys.intern(symbol) if symbol else symbol,
+                transaction_type=TRANSACTION_TYPES[type_code],
+                currency=sys.intern(currency) if currency else currency,
+                ISIN=sys.intern(isin) if isin else isin,
+                quantity=quantity,
+                price=price,
+                fees=fees,
+            )
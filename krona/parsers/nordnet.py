@@ -1,10 +1,33 @@
+import codecs
+import io
+import sys
 from collections.abc import Iterator
 
 import polars as pl
 
-from krona.models.transaction import Transaction, TransactionType
+from krona.models.transaction import TRANSACTION_TERM_CODES, TRANSACTION_TYPES, Transaction
 from krona.parsers.base import BaseParser
 
+# Suffixes Nordnet appends to the symbol of a delisted or replaced security
+OLD_SUFFIX_PATTERN = r"\.OLD(?:/[XY])?$"
+
+# Types of the columns the parser reads, so the reader yields them directly instead of inferring and casting.
+# Antal is left to inference and cast in the select, which truncates fractional quantities like int() did.
+# Kurs and Courtage are read as text so a malformed amount skips its row instead of failing the whole read.
+SCHEMA_OVERRIDES = {
+    "Affärsdag": pl.Date,
+    "Värdepapper": pl.Utf8,
+    "Transaktionstyp": pl.Utf8,
+    "Valuta": pl.Utf8,
+    "ISIN": pl.Utf8,
+    "Kurs": pl.Utf8,
+    "Courtage": pl.Utf8,
+}
+
+UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+# Enough of the file to hold the header line, which is under 1 KiB in utf-16
+HEADER_BYTES = 8192
+
 NORDNET_FIELDNAMES = [
     "Id",
     "Bokföringsdag",
@@ -37,46 +60,99 @@ NORDNET_FIELDNAMES = [
     "Referensvalutakurs",
     "Initial låneränta",
 ]
+NORDNET_FIELDSET = frozenset(NORDNET_FIELDNAMES)
+
+
+def _amount(column: str) -> pl.Expr:
+    """Parse a decimal-comma amount column; empty cells become 0.0 and malformed ones null."""
+    parsed = pl.col(column).str.strip_chars().str.replace(",", ".", literal=True).cast(pl.Float64, strict=False)
+    return pl.when(pl.col(column).is_null()).then(0.0).otherwise(parsed).alias(column)
 
 
 class NordnetParser(BaseParser):
     name = "nordnet"
 
     def is_valid_file(self, file_path: str) -> bool:
+        # Only the header line is needed, so decode the first block instead of the whole export
         try:
-            df = pl.read_csv(file_path, separator="\t", encoding="utf-16")
-            return set(NORDNET_FIELDNAMES).issubset(set(df.columns))
-        except UnicodeDecodeError:
+            with open(file_path, "rb") as f:
+                head = f.read(HEADER_BYTES)
+            # Nordnet exports are utf-16 with a BOM; anything else is rejected before decoding
+            if not head.startswith(UTF16_BOMS):
+                return False
+            head = codecs.getincrementaldecoder("utf-16")().decode(head)
+        except UnicodeError:
             return False
+        header = head.split("\n", 1)[0].rstrip("\r")
+        return NORDNET_FIELDSET.issubset(column.strip('"') for column in header.split("\t"))
+
+    def _scan(self, file_path: str) -> pl.LazyFrame | None:
+        """Lazily scan a Nordnet export, or return None if the file isn't one."""
+        # Polars can only scan utf8, so decode the export ourselves; the scan then parses just the projected columns
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if not data.startswith(UTF16_BOMS):
+                return None
+            data = data.decode("utf-16").encode("utf-8")
+            lf = pl.scan_csv(
+                io.BytesIO(data),
+                separator="\t",
+                decimal_comma=True,
+                schema_overrides=SCHEMA_OVERRIDES,
+            )
+            columns = lf.collect_schema().names()
+        except (UnicodeError, pl.exceptions.PolarsError):
+            return None
+        return lf if NORDNET_FIELDSET.issubset(columns) else None
 
     def parse_file(self, file_path: str) -> Iterator[Transaction]:
-        if not self.is_valid_file(file_path):
+        # Validated from the same scan that is parsed, so the file is only read once
+        lf = self._scan(file_path)
+        if lf is None:
             return
 
-        df = pl.read_csv(file_path, separator="\t", encoding="utf-16", decimal_comma=True, try_parse_dates=True).sort(
-            by="Affärsdag"
+        # Clean and coerce whole columns; the row loop only interns strings and builds Transactions.
+        # Missing strings become "None", as str() made them before.
+        df = (
+            lf.select(
+                "Affärsdag",
+                pl.col("Värdepapper")
+                .fill_null("None")
+                .str.strip_chars()
+                .str.replace(OLD_SUFFIX_PATTERN, "")
+                .str.strip_chars(),
+                # Classify the whole column at once; rows of unknown types come out as null and are dropped
+                pl.col("Transaktionstyp")
+                .str.strip_chars()
+                .str.to_lowercase()
+                .replace_strict(TRANSACTION_TERM_CODES, default=None, return_dtype=pl.Int8),
+                pl.col("Valuta").fill_null("None"),
+                pl.col("ISIN").fill_null("None"),
+                pl.col("Antal").cast(pl.Int64, strict=False).abs(),
+                _amount("Kurs"),
+                _amount("Courtage"),
+            )
+            # Rows with an unparseable amount are skipped, as the ValueError from float() did
+            .drop_nulls(["Transaktionstyp", "Antal", "Kurs", "Courtage"])
+            .collect()
         )
-        for row in df.iter_rows(named=True):
-            try:
-                symbol = str(row["Värdepapper"]).strip()
-                for suffix in [".OLD", ".OLD/X", ".OLD/Y"]:
-                    if symbol.endswith(suffix):
-                        symbol = symbol.replace(suffix, "").strip()
-
-                yield Transaction(
-                    date=row["Affärsdag"],
-                    symbol=symbol,
-                    transaction_type=TransactionType.from_term(str(row["Transaktionstyp"])),
-                    currency=str(row["Valuta"]),
-                    ISIN=str(row["ISIN"]),
-                    quantity=abs(int(row["Antal"])),
-                    price=float(row["Kurs"] or 0.0),
-                    fees=float(row["Courtage"] or 0.0),
-                )
-            except ValueError:
-                # TransactionType not found
-                # logger.warning("Possible error in transaction, skipping:\n %s", row)
-                continue
+        # Skip the sort when the export is already in date order; a stable sort keeps same-day rows in file order
+        if not df["Affärsdag"].is_sorted():
+            df = df.sort(by="Affärsdag", maintain_order=True)
+
+        rows = df.iter_rows()
+        for row_date, symbol, type_code, currency, isin, quantity, price, fees in rows:
+            yield Transaction(
+                date=row_date,
+                symbol=sys.intern(symbol),
+                transaction_type=TRANSACTION_TYPES[type_code],
+                currency=sys.intern(currency),
+                ISIN=sys.intern(isin),
+                quantity=quantity,
+                price=price,
+                fees=fees,
+            )
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ This module provides a two-phase approach:
 from __future__ import annotations
 
 from collections import defaultdict
+from datetime import date
+from itertools import count
 from pathlib import Path
 
 import yaml
@@ -18,9 +20,22 @@ from krona.models.suggestion import Suggestion
 from krona.models.transaction import Transaction
 from krona.processor.strategies.conflict_detection import ConflictDetectionStrategy
 from krona.processor.strategies.fuzzy_match import FuzzyMatchStrategy
-from krona.processor.strategies.fuzzy_match_position import FuzzyMatchPositionStrategy
+from krona.processor.strategies.fuzzy_match_position import FuzzyMatchPositionStrategy, PositionIndex
+from krona.utils.io import (
+    DEFAULT_MAPPING_CONFIG_FILE,
+    YAML_LOADER,
+    _KronaDumper,
+    get_config,
+    load_cached_plan,
+    load_mapping_config,
+    plan_signature,
+    save_cached_plan,
+)
 from krona.utils.logger import logger
 
+# Source of mapping generations, shared by all mappers so a transaction never matches another mapper's generation
+_generations = count()
+
 
 class Mapper:
     """Handles mapping of alternative symbols and ISINs to canonical symbols."""
@@ -29,24 +44,37 @@ class Mapper:
         self._symbol_groups: dict[str, SymbolGroup] = {}
         self._symbol_mappings: dict[str, str] = {}
         self._isin_mappings: dict[str, str] = {}
+        # Synonym -> canonical symbol of the first group listing it, rebuilt lazily after groups change
+        self._synonym_index: dict[str, str] | None = None
+        # Symbol -> end of its symbol mapping chain, rebuilt lazily after the mappings change
+        self._resolved_symbols: dict[str, str] | None = None
+        # Bumped whenever the mappings change, invalidating canonical symbols cached on transactions
+        self._generation = next(_generations)
+
+    def _invalidate_caches(self) -> None:
+        """Drop lookups derived from the symbol groups and mappings after they change."""
+        self._synonym_index = None
+        self._resolved_symbols = None
+        self._generation = next(_generations)
 
     def add_mapping(self, canonical: str, synonyms: list[str], isin: str | None = None) -> None:
         """Add a mapping from synonyms to a canonical symbol."""
         # Create or get the symbol group
         if canonical not in self._symbol_groups:
-            self._symbol_groups[canonical] = SymbolGroup(canonical_symbol=canonical, synonyms=[], isins=[])
+            self._symbol_groups[canonical] = SymbolGroup(canonical_symbol=canonical, synonyms=set(), isins=set())
 
         group = self._symbol_groups[canonical]
+        self._invalidate_caches()
 
         # Add synonyms
         for synonym in synonyms:
             if synonym != canonical and synonym not in group.synonyms:
-                group.synonyms.append(synonym)
+                group.synonyms.add(synonym)
                 self._symbol_mappings[synonym] = canonical
 
         # Add ISIN if provided
         if isin and isin not in group.isins:
-            group.isins.append(isin)
+            group.isins.add(isin)
             self._isin_mappings[isin] = canonical
 
     def _prompt_user_for_resolution(self, symbol: str, known_symbols: set[str]) -> str | None:
@@ -55,18 +83,13 @@ class Mapper:
         # For now, return None to indicate no resolution
         return None
 
-    def create_mapping_plan(self, transactions: list[Transaction]) -> MappingPlan:
-        """Create a mapping plan from transactions."""
-        # Group transactions by symbol and ISIN
-        symbol_to_isins: dict[str, set[str]] = defaultdict(set)
-        isin_to_symbols: dict[str, set[str]] = defaultdict(set)
+    def create_mapping_plan(self, transactions: list[Transaction], cache_file: str | None = None) -> MappingPlan:
+        """Create a mapping plan from transactions.
 
-        for transaction in transactions:
-            if transaction.symbol and transaction.ISIN:
-                symbol = transaction.symbol.strip()
-                isin = transaction.ISIN.strip()
-                symbol_to_isins[symbol].add(isin)
-                isin_to_symbols[isin].add(symbol)
+        If cache_file is given, the generated plan is cached there and reused on later runs with the same
+        symbols, ISINs, existing mappings and matching config, skipping the fuzzy matching.
+        """
+        symbol_to_isins, isin_to_symbols, first_isin_dates = self._group_transactions(transactions)
 
         # Load existing mappings first
         self._load_existing_mappings()
@@ -85,29 +108,76 @@ class Mapper:
             for isin in group.isins:
                 isin_mappings[isin] = canonical_symbol
 
-        # Find fuzzy matches for symbols that share ISINs
-        plan = MappingPlan(
-            symbol_mappings=symbol_mappings,
-            isin_mappings=isin_mappings,
-            suggestions=[],  # Initialize suggestions as empty
-        )
-        fuzzy_match_strategy = FuzzyMatchStrategy()
-        fuzzy_match_strategy.execute(
-            plan=plan,
-            symbol_to_isins=symbol_to_isins,
-            isin_to_symbols=isin_to_symbols,
-            transactions=transactions,
-        )
-
-        # Add fuzzy matches to conflicts for user review
-        conflict_detection_strategy = ConflictDetectionStrategy()
-        conflict_detection_strategy.execute(plan=plan)
+        signature = None
+        cached_plan = None
+        if cache_file:
+            signature = plan_signature(
+                [(symbol, sorted(isins)) for symbol, isins in symbol_to_isins.items()],
+                first_isin_dates,
+                symbol_mappings,
+                isin_mappings,
+                get_config(),
+            )
+            cached_plan = load_cached_plan(signature, cache_file)
+
+        if cached_plan:
+            logger.debug(f"Loaded cached mapping plan from {cache_file}")
+            plan = cached_plan
+        else:
+            # Find fuzzy matches for symbols that share ISINs
+            plan = MappingPlan(
+                symbol_mappings=symbol_mappings,
+                isin_mappings=isin_mappings,
+                suggestions=[],  # Initialize suggestions as empty
+            )
+            fuzzy_match_strategy = FuzzyMatchStrategy()
+            fuzzy_match_strategy.execute(
+                plan=plan,
+                symbol_to_isins=symbol_to_isins,
+                isin_to_symbols=isin_to_symbols,
+                transactions=transactions,
+                first_isin_dates=first_isin_dates,
+            )
+
+            # Add fuzzy matches to conflicts for user review
+            conflict_detection_strategy = ConflictDetectionStrategy()
+            conflict_detection_strategy.execute(plan=plan)
+
+            if cache_file and signature:
+                save_cached_plan(signature, plan, cache_file)
 
         # Load previously accepted/denied suggestions
         self._load_previous_decisions()
 
         return plan
 
+    @staticmethod
+    def _group_transactions(
+        transactions: list[Transaction],
+    ) -> tuple[dict[str, set[str]], dict[str, set[str]], dict[str, date]]:
+        """Group transactions by symbol and ISIN in a single pass.
+
+        Also collects the earliest date per ISIN for the fuzzy match rationales.
+        """
+        symbol_to_isins: dict[str, set[str]] = defaultdict(set)
+        isin_to_symbols: dict[str, set[str]] = defaultdict(set)
+        first_isin_dates: dict[str, date] = {}
+
+        for transaction in transactions:
+            isin = transaction.ISIN
+            if not isin:
+                continue
+            first_date = first_isin_dates.get(isin)
+            if first_date is None or transaction.date < first_date:
+                first_isin_dates[isin] = transaction.date
+            symbol = transaction.symbol
+            if symbol:
+                symbol, isin = symbol.strip(), isin.strip()
+                symbol_to_isins[symbol].add(isin)
+                isin_to_symbols[isin].add(symbol)
+
+        return symbol_to_isins, isin_to_symbols, first_isin_dates
+
     def accept_plan(self, plan: MappingPlan) -> None:
         """Accept a mapping plan and convert to symbol groups."""
         # Convert flat mappings to symbol groups
@@ -116,52 +186,85 @@ class Mapper:
         # Update internal mappings for backward compatibility
         self._symbol_mappings = plan.symbol_mappings
         self._isin_mappings = plan.isin_mappings
-
-    def match_transaction_to_position(self, transaction: Transaction, positions: dict[str, Position]) -> str | None:
-        """Match a transaction to an existing position."""
-        canonical_symbol = self._get_canonical_symbol(transaction)
+        self._invalidate_caches()
+
+    def match_transaction_to_position(
+        self, transaction: Transaction, positions: dict[str, Position], position_index: PositionIndex | None = None
+    ) -> str | None:
+        """Match a transaction to an existing position.
+
+        position_index is an index of positions kept up to date by the caller; it is built from positions if omitted.
+        """
+        if transaction.canonical_generation != self._generation:
+            transaction.canonical_symbol = self._get_canonical_symbol(transaction)
+            transaction.canonical_generation = self._generation
         strategy = FuzzyMatchPositionStrategy()
         return strategy.execute(
             transaction=transaction,
             positions=positions,
-            canonical_symbol=canonical_symbol,
+            canonical_symbol=transaction.canonical_symbol,
+            position_index=position_index,
         )
 
     def _get_canonical_symbol(self, transaction: Transaction) -> str:
         """Get the canonical symbol for a transaction."""
         symbol = transaction.symbol or ""
+        symbol = self._get_resolved_symbols().get(symbol, symbol)
+
+        # If we have an ISIN, also check ISIN mappings
+        isin_symbol = self._isin_mappings.get(transaction.ISIN) if transaction.ISIN else None
+        # If ISIN maps to a different symbol, use that
+        if isin_symbol is not None and isin_symbol != symbol:
+            symbol = isin_symbol
 
-        # Apply symbol mappings with cycle detection
-        seen_symbols = set()
-        max_iterations = 100  # Prevent infinite loops
+        return symbol
 
-        for _ in range(max_iterations):
-            if symbol not in self._symbol_mappings:
-                break
-            if symbol in seen_symbols:
+    def _get_resolved_symbols(self) -> dict[str, str]:
+        """Map every mapped symbol to the end of its mapping chain.
+
+        Chains are followed once for the whole table, with each walk stopping at symbols resolved by an
+        earlier one. A chain that runs into a cycle ends at the first symbol of the cycle it reaches.
+        """
+        if self._resolved_symbols is not None:
+            return self._resolved_symbols
+
+        resolved: dict[str, str] = {}
+        for start in self._symbol_mappings:
+            path: list[str] = []
+            on_path: dict[str, int] = {}
+            symbol = start
+            while symbol not in resolved and symbol in self._symbol_mappings and symbol not in on_path:
+                on_path[symbol] = len(path)
+                path.append(symbol)
+                symbol = self._symbol_mappings[symbol]
+
+            if symbol in on_path:
                 logger.warning(f"Circular mapping detected for symbol: {symbol}")
-                break
-            seen_symbols.add(symbol)
-            symbol = self._symbol_mappings[symbol]
+                # Symbols on the cycle resolve to themselves, the ones leading into it to where they enter
+                cycle_start = on_path[symbol]
+                for cycle_symbol in path[cycle_start:]:
+                    resolved[cycle_symbol] = cycle_symbol
+                path = path[:cycle_start]
+            else:
+                symbol = resolved.get(symbol, symbol)
 
-        # If we have an ISIN, also check ISIN mappings
-        if transaction.ISIN and transaction.ISIN in self._isin_mappings:
-            isin_symbol = self._isin_mappings[transaction.ISIN]
-            # If ISIN maps to a different symbol, use that
-            if isin_symbol != symbol:
-                symbol = isin_symbol
+            for path_symbol in path:
+                resolved[path_symbol] = symbol
 
-        return symbol
+        self._resolved_symbols = resolved
+        return resolved
 
     def _get_ticker(self, symbol: str, isin: str | None = None) -> str:
         """Get the canonical ticker for a symbol."""
         # Try direct symbol mapping first
-        if symbol in self._symbol_mappings:
-            return self._symbol_mappings[symbol]
+        ticker = self._symbol_mappings.get(symbol)
+        if ticker is not None:
+            return ticker
 
         # Try ISIN mapping if ISIN is provided
-        if isin and isin in self._isin_mappings:
-            return self._isin_mappings[isin]
+        ticker = self._isin_mappings.get(isin) if isin else None
+        if ticker is not None:
+            return ticker
 
         # Return the original symbol if no mapping found
         return symbol
@@ -169,19 +272,25 @@ class Mapper:
     def _get_canonical_symbol_from_position(self, position_name: str) -> str | None:
         """Get the canonical symbol for a position name."""
         # Try direct symbol mapping first
-        if position_name in self._symbol_mappings:
-            return self._symbol_mappings[position_name]
+        canonical = self._symbol_mappings.get(position_name)
+        if canonical is not None:
+            return canonical
 
         # Check if this position name is a canonical symbol
         if position_name in self._symbol_groups:
             return position_name
 
         # Check if any synonym maps to this position name
-        for canonical, group in self._symbol_groups.items():
-            if position_name in group.synonyms:
-                return canonical
+        return self._get_synonym_index().get(position_name)
 
-        return None
+    def _get_synonym_index(self) -> dict[str, str]:
+        """Map every synonym to the canonical symbol of the first group that lists it."""
+        if self._synonym_index is None:
+            self._synonym_index = {}
+            for canonical, group in self._symbol_groups.items():
+                for synonym in group.synonyms:
+                    self._synonym_index.setdefault(synonym, canonical)
+        return self._synonym_index
 
     def _convert_mappings_to_groups(self, symbol_mappings: dict[str, str], isin_mappings: dict[str, str]) -> None:
         """Convert flat mappings to symbol groups."""
@@ -194,106 +303,77 @@ class Mapper:
         for source, target in symbol_mappings.items():
             if source != target:  # Skip identical mappings
                 if target not in canonical_groups:
-                    canonical_groups[target] = SymbolGroup(canonical_symbol=target, synonyms=[], isins=[])
-                canonical_groups[target].synonyms.append(source)
+                    canonical_groups[target] = SymbolGroup(canonical_symbol=target, synonyms=set(), isins=set())
+                canonical_groups[target].synonyms.add(source)
 
         # Process ISIN mappings
         for isin, canonical_symbol in isin_mappings.items():
             if canonical_symbol not in canonical_groups:
                 canonical_groups[canonical_symbol] = SymbolGroup(
-                    canonical_symbol=canonical_symbol, synonyms=[], isins=[]
+                    canonical_symbol=canonical_symbol, synonyms=set(), isins=set()
                 )
-            canonical_groups[canonical_symbol].isins.append(isin)
+            canonical_groups[canonical_symbol].isins.add(isin)
 
         # Consolidate related groups to avoid circular dependencies and merge synonyms
         self._symbol_groups = self._consolidate_symbol_groups(canonical_groups)
+        self._invalidate_caches()
 
     def _consolidate_symbol_groups(self, groups: dict[str, SymbolGroup]) -> dict[str, SymbolGroup]:  # noqa: C901
         """Consolidate related symbol groups to avoid circular dependencies and merge synonyms."""
         if not groups:
             return groups
 
-        # Create a mapping from any symbol to its canonical group
-        symbol_to_group: dict[str, str] = {}
-        for canonical, group in groups.items():
-            symbol_to_group[canonical] = canonical
-            for synonym in group.synonyms:
-                symbol_to_group[synonym] = canonical
-
-        # Find all connected components (groups that should be merged)
-        merged_groups: dict[str, SymbolGroup] = {}
-        processed_symbols = set()
-
-        for canonical, _group in groups.items():
-            if canonical in processed_symbols:
-                continue
+        # Union-find over the canonical-synonym links of all groups
+        parent: dict[str, str] = {}
 
-            # Find all related symbols using a more comprehensive approach
-            related_symbols = set()
-            to_process = {canonical}
+        def find(symbol: str) -> str:
+            root = parent.setdefault(symbol, symbol)
+            while root != parent[root]:
+                root = parent[root]
+            # Point everything on the way directly at the root
+            while symbol != root:
+                parent[symbol], symbol = root, parent[symbol]
+            return root
 
-            while to_process:
-                current = to_process.pop()
-                if current in related_symbols:
-                    continue
-
-                related_symbols.add(current)
-
-                # Add all synonyms of current symbol
-                if current in groups:
-                    for synonym in groups[current].synonyms:
-                        if synonym not in related_symbols:
-                            to_process.add(synonym)
-
-                # Add the canonical symbol that this symbol maps to
-                if current in symbol_to_group:
-                    target = symbol_to_group[current]
-                    if target not in related_symbols:
-                        to_process.add(target)
+        for canonical, group in groups.items():
+            root = find(canonical)
+            for synonym in group.synonyms:
+                synonym_root = find(synonym)
+                if synonym_root != root:
+                    parent[synonym_root] = root
 
-                # Add all symbols that map to current symbol
-                for sym, target in symbol_to_group.items():
-                    if target == current and sym not in related_symbols:
-                        to_process.add(sym)
+        # Collect the connected components, ordered by the first group in each
+        components: dict[str, set[str]] = {find(canonical): set() for canonical in groups}
+        for symbol in parent:
+            components[find(symbol)].add(symbol)
 
+        merged_groups: dict[str, SymbolGroup] = {}
+        for related_symbols in components.values():
             # Choose the best canonical symbol from the related group
             # Prefer the one with the most descriptive name (longer, more mixed case)
             best_canonical = max(related_symbols, key=lambda s: (len(s), sum(1 for c in s if c.islower())))
 
-            # Create a consolidated group
-            consolidated_group = SymbolGroup(canonical_symbol=best_canonical, synonyms=[], isins=[])
+            # The other symbols become synonyms; the chosen canonical is never its own synonym
+            consolidated_group = SymbolGroup(
+                canonical_symbol=best_canonical, synonyms=related_symbols - {best_canonical}, isins=set()
+            )
 
-            # Collect all synonyms and ISINs from related groups
+            # Collect all ISINs from related groups
             for symbol in related_symbols:
                 if symbol in groups:
-                    source_group = groups[symbol]
-                    # Add synonyms (excluding the canonical symbol itself)
-                    for synonym in source_group.synonyms:
-                        if synonym != best_canonical and synonym not in consolidated_group.synonyms:
-                            consolidated_group.synonyms.append(synonym)
-                    # Add ISINs
-                    for isin in source_group.isins:
-                        if isin not in consolidated_group.isins:
-                            consolidated_group.isins.append(isin)
-
-            # Add the other canonical symbols as synonyms if they're not the chosen canonical
-            for symbol in related_symbols:
-                if symbol != best_canonical and symbol not in consolidated_group.synonyms:
-                    consolidated_group.synonyms.append(symbol)
+                    consolidated_group.isins.update(groups[symbol].isins)
 
             merged_groups[best_canonical] = consolidated_group
-            processed_symbols.update(related_symbols)
 
         return merged_groups
 
     def _load_existing_mappings(self) -> None:
         """Load existing mappings from the mappings.yml file without user prompt."""
-        from krona.utils.io import DEFAULT_MAPPING_CONFIG_FILE, load_mapping_config
-
         existing_plan = load_mapping_config(DEFAULT_MAPPING_CONFIG_FILE)
         if not existing_plan:
             return
 
+        self._invalidate_caches()
         try:
             # Load from the existing plan
             for source_symbol, canonical_symbol in existing_plan.symbol_mappings.items():
@@ -302,8 +382,7 @@ class Mapper:
                 # Update symbol groups
                 if canonical_symbol not in self._symbol_groups:
                     self._symbol_groups[canonical_symbol] = SymbolGroup(canonical_symbol=canonical_symbol)
-                if source_symbol not in self._symbol_groups[canonical_symbol].synonyms:
-                    self._symbol_groups[canonical_symbol].synonyms.append(source_symbol)
+                self._symbol_groups[canonical_symbol].synonyms.add(source_symbol)
 
             for isin, canonical_symbol in existing_plan.isin_mappings.items():
                 self._isin_mappings[isin] = canonical_symbol
@@ -311,8 +390,7 @@ class Mapper:
                 # Update symbol groups
                 if canonical_symbol not in self._symbol_groups:
                     self._symbol_groups[canonical_symbol] = SymbolGroup(canonical_symbol=canonical_symbol)
-                if isin not in self._symbol_groups[canonical_symbol].isins:
-                    self._symbol_groups[canonical_symbol].isins.append(isin)
+                self._symbol_groups[canonical_symbol].isins.add(isin)
 
         except Exception as e:
             logger.warning(f"Failed to load existing mappings: {e}")
@@ -323,13 +401,9 @@ class Mapper:
         if not self._symbol_groups:
             self._convert_mappings_to_groups(self._symbol_mappings, self._isin_mappings)
 
-        # Convert to YAML format
-        yaml_data = {}
-        for canonical_symbol, group in self._symbol_groups.items():
-            yaml_data[canonical_symbol] = group.to_dict()
-
+        # Symbol groups are written through the SymbolGroup representer registered on _KronaDumper
         with open(path, "w") as f:
-            yaml.dump(yaml_data, f, default_flow_style=False, sort_keys=True)
+            yaml.dump(self._symbol_groups, f, Dumper=_KronaDumper, default_flow_style=False, sort_keys=True)
 
     def save_decisions(
         self,
@@ -343,7 +417,7 @@ class Mapper:
         if path.exists():
             try:
                 with open(path) as f:
-                    existing_data = yaml.safe_load(f) or {}
+                    existing_data = yaml.load(f, Loader=YAML_LOADER) or {}  # noqa: S506
             except Exception as e:
                 logger.warning(f"Failed to load existing mappings.yml: {e}")
 
@@ -352,7 +426,7 @@ class Mapper:
         existing_data["denied_suggestions"] = [s.rationale for s in denied_suggestions]
 
         with open(path, "w") as f:
-            yaml.dump(existing_data, f, default_flow_style=False, sort_keys=True)
+            yaml.dump(existing_data, f, Dumper=_KronaDumper, default_flow_style=False, sort_keys=True)
 
     def _load_previous_decisions(self) -> tuple[list[str], list[str]]:
         """Load previously accepted and denied suggestions from mappings.yml."""
@@ -1,4 +1,6 @@
+from collections.abc import Callable
 from datetime import timedelta
+from fractions import Fraction
 
 from krona.models.action import Action, ActionType
 from krona.models.position import Position
@@ -13,19 +15,10 @@ QUANTITY_EPSILON = 1e-5
 
 def apply_transaction(position: Position, transaction: Transaction) -> Position:
     """Apply a transaction to the position."""
-    logger.debug(f"Applying transaction to position {position.symbol}: {transaction.transaction_type.value}")
-
-    match transaction.transaction_type:
-        case TransactionType.BUY:
-            position = _handle_buy(position, transaction)
-        case TransactionType.SELL:
-            position = _handle_sell(position, transaction)
-        case TransactionType.DIVIDEND:
-            position = _handle_dividend(position, transaction)
-        case TransactionType.SPLIT:
-            position = _handle_split(position, transaction)
-        case TransactionType.MOVE:
-            position = _handle_move(position, transaction)
+    # Lazy %-style args: apply_transaction runs per transaction, and debug is usually off
+    logger.debug("Applying transaction to position %s: %s", position.symbol, transaction.transaction_type.value)
+
+    position = TRANSACTION_HANDLERS[transaction.transaction_type](position, transaction)
 
     position.fees += transaction.fees
     position.transactions.append(transaction)
@@ -36,6 +29,8 @@ def apply_transaction(position: Position, transaction: Transaction) -> Position:
 
 
 def _handle_buy(position: Position, transaction: Transaction) -> Position:
+    # Counted even if the buy is rejected below, since it is still recorded on the position
+    position.total_bought += transaction.total_amount
     new_quantity = position.quantity + transaction.quantity
 
     # Clamp tiny float residue to zero to avoid keeping positions open due to rounding errors
@@ -66,6 +61,7 @@ def _handle_buy(position: Position, transaction: Transaction) -> Position:
 
 
 def _handle_sell(position: Position, transaction: Transaction) -> Position:
+    position.total_sold += transaction.total_amount
     new_quantity = position.quantity - transaction.quantity
 
     # Clamp tiny float residue to zero to avoid keeping positions open due to rounding errors
@@ -90,25 +86,31 @@ def _handle_dividend(position: Position, transaction: Transaction) -> Position:
 
 def _handle_split(position: Position, transaction: Transaction) -> Position:
     logger.debug(
-        f"Processing split transaction: {transaction.symbol} ({transaction.ISIN}) with quantity {transaction.quantity}"
+        "Processing split transaction: %s (%s) with quantity %s",
+        transaction.symbol,
+        transaction.ISIN,
+        transaction.quantity,
     )
 
-    previous_transaction = None
-    if position.transaction_buffer:
-        previous_transaction = position.transaction_buffer.pop(0)
+    previous_transaction = position.pending_split
+    position.pending_split = None
 
     if previous_transaction is None:
-        logger.debug(f"No previous split transaction found, buffering: {transaction.symbol}")
-        position.transaction_buffer.append(transaction)
+        logger.debug("No previous split transaction found, buffering: %s", transaction.symbol)
+        position.pending_split = transaction
         return position
 
     if previous_transaction.date == transaction.date and transaction.quantity / previous_transaction.quantity < 1:
         logger.warning(
-            f"Assuming split ratio is {previous_transaction.quantity / transaction.quantity} for {transaction.symbol} at {transaction.date}. No reverse split is supported."
+            "Assuming split ratio is %s for %s at %s. No reverse split is supported.",
+            previous_transaction.quantity / transaction.quantity,
+            transaction.symbol,
+            transaction.date,
         )
         transaction, previous_transaction = previous_transaction, transaction
 
-    split_ratio = transaction.quantity / previous_transaction.quantity
+    # Exact ratio of the two legs, so integer holdings scale without float residue
+    split_ratio = Fraction(transaction.quantity) / Fraction(previous_transaction.quantity)
 
     split = Action(
         date=transaction.date,
@@ -120,13 +122,18 @@ def _handle_split(position: Position, transaction: Transaction) -> Position:
         ratio=split_ratio,
     )
 
-    new_quantity = position.quantity * split.ratio
-    new_price = position.price / split.ratio
-
-    new_quantity = 0 if abs(new_quantity) < QUANTITY_EPSILON else round(new_quantity)
+    new_quantity = round(position.quantity * split.ratio)
+    # Stored as a float: the price is still the int 0 when the position has not been bought yet
+    new_price = float(position.price / split.ratio)
 
     logger.info(
-        f"Split {position.symbol} from {position.quantity} @ {position.price:.2f} to {new_quantity} @ {new_price:.2f} (split ratio: {split.ratio})"
+        "Split %s from %s @ %.2f to %s @ %.2f (split ratio: %s)",
+        position.symbol,
+        position.quantity,
+        position.price,
+        new_quantity,
+        new_price,
+        split.ratio,
     )
 
     position.price = new_price
@@ -152,5 +159,16 @@ def _handle_move(position: Position, transaction: Transaction) -> Position:
     """Handle a move transaction. Does nothing for now, since moves are harmless.
     TODO: handle this gracefully by emitting one MOVE transaction instead of one per broker.
     """
-    logger.debug(f"Processing move: {transaction.symbol} ({transaction.ISIN}) with quantity {transaction.quantity}")
+    logger.debug(
+        "Processing move: %s (%s) with quantity %s", transaction.symbol, transaction.ISIN, transaction.quantity
+    )
     return position
+
+
+TRANSACTION_HANDLERS: dict[TransactionType, Callable[[Position, Transaction], Position]] = {
+    TransactionType.BUY: _handle_buy,
+    TransactionType.SELL: _handle_sell,
+    TransactionType.DIVIDEND: _handle_dividend,
+    TransactionType.SPLIT: _handle_split,
+    TransactionType.MOVE: _handle_move,
+}
@@ -1,6 +1,9 @@
+from collections.abc import Callable
+from datetime import date
 from typing import TYPE_CHECKING, Any
 
-from thefuzz import fuzz
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
 from krona.models.suggestion import Suggestion
 from krona.models.transaction import Transaction
@@ -11,19 +14,24 @@ if TYPE_CHECKING:
     from krona.processor.mapper import MappingPlan
 
 
+def first_isin_dates(transactions: list[Transaction]) -> dict[str, date]:
+    """Map each ISIN to the date of its earliest transaction."""
+    first_dates: dict[str, date] = {}
+    for t in transactions:
+        if t.ISIN and (t.ISIN not in first_dates or t.date < first_dates[t.ISIN]):
+            first_dates[t.ISIN] = t.date
+    return first_dates
+
+
 def _generate_rationale(
     source_isin: str | None,
     target_isin: str | None,
-    transactions: list[Transaction],
+    first_dates: dict[str, date],
 ) -> str:
     """Generate a rationale for the suggestion."""
     if source_isin and target_isin and source_isin != target_isin:
-        # Find the earliest transaction date for the new ISIN to approximate split date
-        split_date = None
-        for t in sorted(transactions, key=lambda x: x.date):
-            if target_isin == t.ISIN:
-                split_date = t.date
-                break
+        # Use the earliest transaction date for the new ISIN to approximate split date
+        split_date = first_dates.get(target_isin)
         if split_date:
             return f"ISIN change on {split_date.strftime('%Y-%m-%d')}"
         return "ISIN change"
@@ -31,27 +39,77 @@ def _generate_rationale(
     return ""
 
 
-def _fuzzy_match(symbol1: str, symbol2: str, config: dict[str, Any]) -> bool:
-    """Enhanced fuzzy matching for symbols using multiple strategies."""
+# Latin-1 code points dropped before token scoring, matching the force_ascii preprocessing of thefuzz
+NON_ASCII = dict.fromkeys(range(128, 256))
+
+
+def _token_process(symbol: str) -> str:
+    """Preprocess a lowercased symbol for the token scorers."""
+    return default_process(symbol.translate(NON_ASCII))
+
+
+def _reaches(scorer: Callable[..., float], symbol1: str, symbol2: str, threshold: float) -> bool:
+    """Check whether the rounded score reaches the threshold.
+
+    Scores are rounded to whole percentages as before, so anything from half a point below the threshold can
+    still pass. Below that, the cutoff lets the scorer stop early and return 0.
+    """
+    return round(scorer(symbol1, symbol2, score_cutoff=max(threshold - 0.5, 0))) >= threshold
+
+
+def _ratio_within_reach(symbol1: str, symbol2: str, threshold: float) -> bool:
+    """Check whether the lengths alone still allow fuzz.ratio to round up to the threshold.
+
+    The indel distance is at least the length difference, so the ratio is at most 200 * shorter / total.
+    """
+    shorter, total = min(len(symbol1), len(symbol2)), len(symbol1) + len(symbol2)
+    return 400 * shorter >= (2 * threshold - 1) * total
+
+
+def _fuzzy_match_lowered(symbol1: str, symbol2: str, config: dict[str, Any]) -> bool:
+    """Enhanced fuzzy matching for lowercased symbols using multiple strategies."""
     # Try exact match first (case insensitive)
-    if symbol1.lower() == symbol2.lower():
+    if symbol1 == symbol2:
+        return True
+
+    # Use multiple fuzzy matching strategies, stopping at the first one that is high enough
+    ratio_threshold = config["ratio"]
+    if (
+        _ratio_within_reach(symbol1, symbol2, ratio_threshold)
+        and _reaches(fuzz.ratio, symbol1, symbol2, ratio_threshold)
+    ) or _reaches(fuzz.partial_ratio, symbol1, symbol2, config["partial_ratio"]):
         return True
 
-    # Use multiple fuzzy matching strategies
-    ratio = fuzz.ratio(symbol1.lower(), symbol2.lower())
-    partial_ratio = fuzz.partial_ratio(symbol1.lower(), symbol2.lower())
-    token_sort_ratio = fuzz.token_sort_ratio(symbol1.lower(), symbol2.lower())
-    token_set_ratio = fuzz.token_set_ratio(symbol1.lower(), symbol2.lower())
-
-    # Check if any of the ratios are high enough
-    return bool(
-        ratio >= config["ratio"]
-        or partial_ratio >= config["partial_ratio"]
-        or token_sort_ratio >= config["token_sort_ratio"]
-        or token_set_ratio >= config["token_set_ratio"]
+    tokens1, tokens2 = _token_process(symbol1), _token_process(symbol2)
+    return _reaches(fuzz.token_sort_ratio, tokens1, tokens2, config["token_sort_ratio"]) or _reaches(
+        fuzz.token_set_ratio, tokens1, tokens2, config["token_set_ratio"]
     )
 
 
+def _fuzzy_matches_after(index: int, lowered: list[str], tokens: list[str], config: dict[str, Any]) -> list[int]:
+    """Indices of the symbols after lowered[index] that _fuzzy_match_lowered would accept, in ascending order.
+
+    lowered holds the lowercased symbols and tokens their token-preprocessed form. Each scorer runs over
+    all remaining candidates in a single rapidfuzz call, not once per pair.
+    """
+    start = index + 1
+    query = lowered[index]
+    matches = {j for j in range(start, len(lowered)) if lowered[j] == query}
+    for scorer, choices, key in (
+        (fuzz.ratio, lowered, "ratio"),
+        (fuzz.partial_ratio, lowered, "partial_ratio"),
+        (fuzz.token_sort_ratio, tokens, "token_sort_ratio"),
+        (fuzz.token_set_ratio, tokens, "token_set_ratio"),
+    ):
+        threshold = config[key]
+        for _, score, j in process.extract_iter(
+            choices[index], choices[start:], scorer=scorer, score_cutoff=max(threshold - 0.5, 0)
+        ):
+            if round(score) >= threshold:
+                matches.add(start + j)
+    return sorted(matches)
+
+
 class FuzzyMatchStrategy(BaseStrategy):
     def __init__(self, config: dict[str, Any] | None = None) -> None:
         if config is None:
@@ -63,37 +121,39 @@ class FuzzyMatchStrategy(BaseStrategy):
         plan: MappingPlan = kwargs["plan"]
         symbol_to_isins: dict[str, set[str]] = kwargs["symbol_to_isins"]
         symbol_mappings: dict[str, str] = plan.symbol_mappings
-        transactions: list[Transaction] = kwargs["transactions"]
+        first_dates: dict[str, date] | None = kwargs.get("first_isin_dates")
+        if first_dates is None:
+            first_dates = first_isin_dates(kwargs["transactions"])
         min_confidence = self.config.get("min_confidence", 0.1)
 
         suggestions: list[Suggestion] = []
-        all_symbols = list(symbol_to_isins.keys())
-        for i, symbol1 in enumerate(all_symbols):
-            for symbol2 in all_symbols[i + 1 :]:
-                if symbol1 in symbol_mappings or symbol2 in symbol_mappings:
+        # Mapped symbols are never suggested, so they are left out of the comparison altogether
+        symbols = [symbol for symbol in symbol_to_isins if symbol not in symbol_mappings]
+        lowered = [symbol.lower() for symbol in symbols]
+        tokens = [_token_process(symbol) for symbol in lowered]
+        for i, symbol1 in enumerate(symbols):
+            for j in _fuzzy_matches_after(i, lowered, tokens, self.config["fuzzy_match"]):
+                symbol2 = symbols[j]
+                similarity = round(fuzz.ratio(lowered[i], lowered[j])) / 100
+                if similarity < min_confidence:
                     continue
 
-                if _fuzzy_match(symbol1, symbol2, self.config["fuzzy_match"]):
-                    similarity = fuzz.ratio(symbol1.lower(), symbol2.lower()) / 100
-                    if similarity < min_confidence:
-                        continue
-
-                    source_isins = symbol_to_isins.get(symbol1)
-                    target_isins = symbol_to_isins.get(symbol2)
-
-                    source_isin = next(iter(source_isins)) if source_isins else None
-                    target_isin = next(iter(target_isins)) if target_isins else None
-
-                    suggestions.append(
-                        Suggestion(
-                            source_symbol=symbol1,
-                            target_symbol=symbol2,
-                            source_isin=source_isin,
-                            target_isin=target_isin,
-                            confidence=similarity,
-                            rationale=_generate_rationale(source_isin, target_isin, transactions),
-                        )
+                source_isins = symbol_to_isins.get(symbol1)
+                target_isins = symbol_to_isins.get(symbol2)
+
+                source_isin = next(iter(source_isins)) if source_isins else None
+                target_isin = next(iter(target_isins)) if target_isins else None
+
+                suggestions.append(
+                    Suggestion(
+                        source_symbol=symbol1,
+                        target_symbol=symbol2,
+                        source_isin=source_isin,
+                        target_isin=target_isin,
+                        confidence=similarity,
+                        rationale=_generate_rationale(source_isin, target_isin, first_dates),
                     )
+                )
 
         suggestions.sort(key=lambda x: x.confidence, reverse=True)
         plan.suggestions.extend(suggestions)
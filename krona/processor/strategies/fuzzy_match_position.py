@@ -1,7 +1,9 @@
+from __future__ import annotations
+
 from typing import TYPE_CHECKING, Any
 
 from krona.processor.strategies.base import BaseStrategy
-from krona.processor.strategies.fuzzy_match import _fuzzy_match
+from krona.processor.strategies.fuzzy_match import _fuzzy_match_lowered
 from krona.utils.io import get_config
 
 if TYPE_CHECKING:
@@ -9,6 +11,26 @@ if TYPE_CHECKING:
     from krona.models.transaction import Transaction
 
 
+# Lowercased symbol -> position symbol, and ISIN -> position symbol
+PositionIndex = tuple[dict[str, str], dict[str, str]]
+
+
+def index_position(index: PositionIndex, symbol: str, position: Position) -> None:
+    """Add a position to the index unless an earlier position already holds its keys."""
+    lowered_positions, isin_positions = index
+    lowered_positions.setdefault(symbol.lower(), symbol)
+    if position.ISIN:
+        isin_positions.setdefault(position.ISIN, symbol)
+
+
+def index_positions(positions: dict[str, Position]) -> PositionIndex:
+    """Index positions by lowercased symbol and by ISIN, keeping the first position in order for each key."""
+    index: PositionIndex = ({}, {})
+    for symbol, position in positions.items():
+        index_position(index, symbol, position)
+    return index
+
+
 class FuzzyMatchPositionStrategy(BaseStrategy):
     def __init__(self, config: dict[str, Any] | None = None) -> None:
         if config is None:
@@ -20,25 +42,29 @@ class FuzzyMatchPositionStrategy(BaseStrategy):
         transaction: Transaction = kwargs["transaction"]
         positions: dict[str, Position] = kwargs["positions"]
         canonical_symbol: str = kwargs["canonical_symbol"]
+        position_index: PositionIndex | None = kwargs.get("position_index")
 
         # Try exact match first
         if canonical_symbol in positions:
             return canonical_symbol
 
+        if position_index is None:
+            position_index = index_positions(positions)
+        lowered_positions, isin_positions = position_index
+
         # Try case-insensitive match
-        for position_symbol in positions:
-            if position_symbol.lower() == canonical_symbol.lower():
-                return position_symbol
+        lowered_symbol = canonical_symbol.lower()
+        if lowered_symbol in lowered_positions:
+            return lowered_positions[lowered_symbol]
 
-        # Try fuzzy matching as fallback
-        for position_symbol in positions:
-            if _fuzzy_match(canonical_symbol, position_symbol, self.config["fuzzy_match"]):
+        # Try fuzzy matching as fallback. Positions sharing a lowercased symbol match alike, so the first one
+        # per lowercased symbol is enough
+        for lowered_position, position_symbol in lowered_positions.items():
+            if _fuzzy_match_lowered(lowered_symbol, lowered_position, self.config["fuzzy_match"]):
                 return position_symbol
 
         # Try direct ISIN matching if transaction has an ISIN
         if transaction.ISIN:
-            for position_symbol, position in positions.items():
-                if position.ISIN == transaction.ISIN:
-                    return position_symbol
+            return isin_positions.get(transaction.ISIN)
 
         return None
@@ -1,7 +1,10 @@
+from collections.abc import Iterable
+
 from krona.models.position import Position
 from krona.models.transaction import Transaction
 from krona.processor.mapper import Mapper
 from krona.processor.position import apply_transaction
+from krona.processor.strategies.fuzzy_match_position import PositionIndex, index_position, index_positions
 from krona.utils.logger import logger
 
 
@@ -13,29 +16,55 @@ class TransactionProcessor:
         self.positions: dict[str, Position] = {}
         self.history: dict[str, list[Transaction]] = {}
         self.mapper = Mapper()
+        # Positions by lowercased symbol and ISIN, extended as positions are created and rebuilt lazily
+        # when a rename reorders them or a split changes an ISIN
+        self._position_index: PositionIndex | None = None
 
     def add_transaction(self, transaction: Transaction) -> None:
         """Process a new transaction and upsert position"""
+        self._match_and_upsert(transaction)
+
+        # Update position names if mappings have changed
+        self._update_position_names()
+
+        logger.debug(f"Processed transaction {transaction}")
+
+    def add_transactions(self, transactions: Iterable[Transaction]) -> None:
+        """Process transactions in bulk, in the order given.
+
+        Transactions are not regrouped by symbol: matching a transaction to a position depends on
+        the positions created by earlier transactions, so the input order must be preserved.
+
+        Mappings cannot change while the batch is processed, so position names only need to be
+        re-checked after a new position is created or a previous pass renamed one.
+        """
+        rename_pending = True  # Mappings may have changed since the last call
+        for transaction in transactions:
+            if self._match_and_upsert(transaction):
+                rename_pending = True
+            if rename_pending:
+                rename_pending = self._update_position_names()
+            logger.debug(f"Processed transaction {transaction}")
+
+    def _match_and_upsert(self, transaction: Transaction) -> bool:
+        """Match a transaction to a position and upsert it. Returns True if a new position was created."""
         logger.debug(
             f"Processing transaction: {transaction.symbol} ({transaction.ISIN}) - {transaction.transaction_type.value} - {transaction.quantity}"
         )
 
         # Use the mapper to match the transaction to an existing position
-        matched_symbol = self.mapper.match_transaction_to_position(transaction, self.positions)
+        matched_symbol = self.mapper.match_transaction_to_position(
+            transaction, self.positions, self._get_position_index()
+        )
         if matched_symbol:
             transaction.symbol = matched_symbol
             logger.debug(f"Mapped transaction to existing position: {matched_symbol}")
 
         # Process the transaction
-        self._upsert_position(transaction, matched_symbol)
-
-        # Update position names if mappings have changed
-        self._update_position_names()
+        return self._upsert_position(transaction, matched_symbol)
 
-        logger.debug(f"Processed transaction {transaction}")
-
-    def _update_position_names(self) -> None:
-        """Update position names based on current mappings."""
+    def _update_position_names(self) -> bool:
+        """Update position names based on current mappings. Returns True if any position was renamed."""
         # Create a mapping from old names to new names
         name_updates = {}
 
@@ -46,12 +75,23 @@ class TransactionProcessor:
                 name_updates[old_name] = canonical
 
         # Apply the name updates
+        renamed = False
         for old_name, new_name in name_updates.items():
             if new_name not in self.positions:  # Only rename if new name doesn't exist
                 position = self.positions.pop(old_name)
                 position.symbol = new_name
                 self.positions[new_name] = position
+                renamed = True
                 logger.debug(f"Renamed position from {old_name} to {new_name}")
+        if renamed:
+            self._position_index = None
+        return renamed
+
+    def _get_position_index(self) -> PositionIndex:
+        """Get the index of positions by lowercased symbol and ISIN, rebuilding it if needed."""
+        if self._position_index is None:
+            self._position_index = index_positions(self.positions)
+        return self._position_index
 
     def _find_or_create_position(self, transaction: Transaction, symbol: str | None) -> tuple[Position, str]:
         # Try to find a position by symbol first
@@ -60,26 +100,45 @@ class TransactionProcessor:
 
         # If no position is found by symbol, try to find one by ISIN
         if transaction.ISIN:
-            for pos_symbol, position in self.positions.items():
-                if position.ISIN == transaction.ISIN:
-                    logger.debug(
-                        f"Found position by ISIN ({transaction.ISIN}) for transaction "
-                        f"{transaction.symbol}, mapping to {pos_symbol}"
-                    )
-                    return position, pos_symbol
+            pos_symbol = self._get_position_index()[1].get(transaction.ISIN)
+            if pos_symbol is not None:
+                logger.debug(
+                    f"Found position by ISIN ({transaction.ISIN}) for transaction "
+                    f"{transaction.symbol}, mapping to {pos_symbol}"
+                )
+                return self.positions[pos_symbol], pos_symbol
 
         # If no position is found by symbol or ISIN, create a new one
         logger.debug(f"Creating new position for {transaction.symbol}")
         return Position.new(transaction), transaction.symbol
 
-    def _upsert_position(self, transaction: Transaction, symbol: str | None) -> None:
-        """Upsert a position with a new transaction"""
+    def _upsert_position(self, transaction: Transaction, symbol: str | None) -> bool:
+        """Upsert a position with a new transaction. Returns True if a new position was created."""
         position, symbol = self._find_or_create_position(transaction, symbol)
+        previous = self.positions.get(symbol)
+        previous_isin = previous.ISIN if previous is not None else None
         position = apply_transaction(position, transaction)
+        created = previous is None
         self.positions[symbol] = position
-        self.history[symbol] = [*self.history.get(symbol, []), transaction]
+        if created:
+            if self._position_index is not None:
+                index_position(self._position_index, symbol, position)
+        elif position is not previous or previous_isin != position.ISIN:
+            # The stored position was replaced by a new one or a split changed its ISIN
+            self._position_index = None
+        self.history.setdefault(symbol, []).append(transaction)
+        return created
 
     def clear_positions(self) -> None:
-        """Clear all positions."""
+        """Clear all positions.
+
+        Cached canonical symbols are reset as well, since positions are cleared before reprocessing
+        transactions with a new mapping plan.
+        """
+        for transactions in self.history.values():
+            for transaction in transactions:
+                transaction.canonical_symbol = None
+                transaction.canonical_generation = -1
         self.positions.clear()
         self.history.clear()
+        self._position_index = None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 from textual.app import ComposeResult
@@ -46,8 +47,6 @@ class PortfolioChart(Chart):
         plot.plotsize(plot_width, plot_height)
 
     def _compute_time_series(self) -> tuple[list[int], list[float], list[int]]:
-        from collections import defaultdict
-
         if not self.positions:
             return [], [], []
 
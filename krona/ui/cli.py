@@ -1,10 +1,13 @@
+from collections.abc import Iterable
+from pathlib import Path
+
 from rich.console import Console
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
 
 from krona.models.mapping import MappingPlan
 from krona.models.position import Position
-from krona.models.suggestion import Suggestion, SuggestionStatus
+from krona.models.suggestion import Suggestion, SuggestionKind, SuggestionStatus
 from krona.models.transaction import Transaction
 from krona.processor.strategies.conflict_detection import ConflictDetectionStrategy
 from krona.processor.transaction import TransactionProcessor
@@ -15,6 +18,12 @@ from krona.utils.io import (
 )
 
 AUTO_ACCEPT_CONFIDENCE = 0.9
+ISIN_COLORS = {SuggestionKind.ISIN_CHANGE: "yellow", SuggestionKind.NAME_MATCH: "green"}
+STATUS_ICONS = {
+    SuggestionStatus.ACCEPTED: "[green]✔[/green]",
+    SuggestionStatus.DECLINED: "[red]✖[/red]",
+    SuggestionStatus.PENDING: "[white]☐[/white]",
+}
 
 
 class CLI:
@@ -31,7 +40,7 @@ class CLI:
         self.processor = processor
         self.transactions = transactions or []
 
-    def display_positions(self, positions: list[Position]) -> None:
+    def display_positions(self, positions: Iterable[Position]) -> None:
         """Display the final positions in a table."""
         table = Table(title="Final Positions", show_header=True, header_style="bold magenta")
         table.add_column("Symbol", style="cyan")
@@ -59,8 +68,6 @@ class CLI:
     @classmethod
     def prompt_load_existing_config(cls, config_file: str = DEFAULT_MAPPING_CONFIG_FILE) -> MappingPlan | None:
         """Prompt the user to load existing mapping configuration if it exists."""
-        from pathlib import Path
-
         config_path = Path(config_file)
 
         if not config_path.exists():
@@ -84,8 +91,18 @@ class CLI:
         """Run the CLI."""
         if not self.plan:
             return MappingPlan({}, {}, [])
-        self._handle_high_confidence_suggestions()
-        self._handle_low_confidence_suggestions()
+        # Split the pending suggestions by confidence once, up front
+        high_confidence_suggestions: list[Suggestion] = []
+        low_confidence_suggestions: list[Suggestion] = []
+        for suggestion in self.plan.pending_suggestions:
+            if suggestion.confidence is None:
+                continue
+            if suggestion.confidence >= AUTO_ACCEPT_CONFIDENCE:
+                high_confidence_suggestions.append(suggestion)
+            else:
+                low_confidence_suggestions.append(suggestion)
+        self._handle_high_confidence_suggestions(high_confidence_suggestions)
+        self._handle_low_confidence_suggestions(low_confidence_suggestions)
         return self.plan
 
     def _handle_existing_mappings(self) -> None:
@@ -104,9 +121,7 @@ class CLI:
 
         while True:
             self._display_suggestions(suggestions)
-            command = Prompt.ask("Enter command")
-
-            match command.lower().split():
+            match self._prompt_command("Enter command"):
                 case ["f"]:
                     self._finish(suggestions)
                     break
@@ -161,24 +176,11 @@ class CLI:
         table.add_column("Info", style="green")
 
         for i, suggestion in enumerate(suggestions):
-            if suggestion.status == SuggestionStatus.ACCEPTED:
-                status_icon = "[green]✔[/green]"
-            elif suggestion.status == SuggestionStatus.DECLINED:
-                status_icon = "[red]✖[/red]"
-            else:
-                status_icon = "[white]☐[/white]"
-
-            isin_color = (
-                "yellow"
-                if suggestion.source_isin
-                and suggestion.target_isin
-                and suggestion.source_isin != suggestion.target_isin
-                else "green"
-            )
+            isin_color = ISIN_COLORS[suggestion.kind]
 
             table.add_row(
                 str(i),
-                status_icon,
+                STATUS_ICONS[suggestion.status],
                 suggestion.source_symbol,
                 suggestion.target_symbol,
                 f"[{isin_color}]{suggestion.source_isin or 'N/A'}[/]",
@@ -195,11 +197,8 @@ class CLI:
 
     def _accept_suggestions(self, id_or_range: str, suggestions: list[Suggestion]) -> None:
         try:
-            start, end = self._parse_id_or_range(id_or_range)
-
-            for idx in range(start, end + 1):
-                if 0 <= idx < len(suggestions):
-                    suggestions[idx].status = SuggestionStatus.ACCEPTED
+            for idx in self._selected_range(id_or_range, len(suggestions)):
+                suggestions[idx].status = SuggestionStatus.ACCEPTED
         except (ValueError, IndexError):
             self.console.print(
                 "[bold red]Invalid ID. Please use a single ID or a range of IDs separated by a dash (e.g. 1-3).[/bold red]"
@@ -207,11 +206,8 @@ class CLI:
 
     def _decline_suggestions(self, id_or_range: str, suggestions: list[Suggestion]) -> None:
         try:
-            start, end = self._parse_id_or_range(id_or_range)
-
-            for idx in range(start, end + 1):
-                if 0 <= idx < len(suggestions):
-                    suggestions[idx].status = SuggestionStatus.DECLINED
+            for idx in self._selected_range(id_or_range, len(suggestions)):
+                suggestions[idx].status = SuggestionStatus.DECLINED
         except (ValueError, IndexError):
             self.console.print(
                 "[bold red]Invalid ID. Please use a single ID or a range of IDs separated by a dash (e.g. 1-3).[/bold red]"
@@ -219,14 +215,11 @@ class CLI:
 
     def _toggle_suggestion(self, id_or_range: str, suggestions: list[Suggestion]) -> None:
         try:
-            start, end = self._parse_id_or_range(id_or_range)
-
-            for idx in range(start, end + 1):
-                if 0 <= idx < len(suggestions):
-                    if suggestions[idx].status == SuggestionStatus.ACCEPTED:
-                        suggestions[idx].status = SuggestionStatus.DECLINED
-                    else:
-                        suggestions[idx].status = SuggestionStatus.ACCEPTED
+            for idx in self._selected_range(id_or_range, len(suggestions)):
+                if suggestions[idx].status == SuggestionStatus.ACCEPTED:
+                    suggestions[idx].status = SuggestionStatus.DECLINED
+                else:
+                    suggestions[idx].status = SuggestionStatus.ACCEPTED
         except (ValueError, IndexError):
             self.console.print(
                 "[bold red]Invalid ID. Please use a single ID or a range of IDs separated by a dash (e.g. 1-3).[/bold red]"
@@ -234,13 +227,10 @@ class CLI:
 
     def _edit_suggestion(self, id_or_range: str, suggestions: list[Suggestion]) -> None:
         try:
-            start, end = self._parse_id_or_range(id_or_range)
-
-            for idx in range(start, end + 1):
-                if 0 <= idx < len(suggestions):
-                    new_target = Prompt.ask(f"Enter new target for '{suggestions[idx].source_symbol}'")
-                    suggestions[idx].target_symbol = new_target
-                    suggestions[idx].status = SuggestionStatus.ACCEPTED
+            for idx in self._selected_range(id_or_range, len(suggestions)):
+                new_target = Prompt.ask(f"Enter new target for '{suggestions[idx].source_symbol}'")
+                suggestions[idx].target_symbol = new_target
+                suggestions[idx].status = SuggestionStatus.ACCEPTED
         except (ValueError, IndexError):
             self.console.print(
                 "[bold red]Invalid ID. Please use a single ID or a range of IDs separated by a dash (e.g. 1-3).[/bold red]"
@@ -253,27 +243,23 @@ class CLI:
             self.plan.symbol_mappings[source] = target
             self.console.print(f"[bold green]Added new mapping: {source} -> {target}[/bold green]")
 
-    def _handle_high_confidence_suggestions(self) -> None:
+    def _handle_high_confidence_suggestions(self, suggestions: list[Suggestion]) -> None:
         """Handle high-confidence suggestions."""
         if self.plan:
-            high_confidence_suggestions = [
-                s
-                for s in self.plan.pending_suggestions
-                if s.confidence is not None and s.confidence >= AUTO_ACCEPT_CONFIDENCE
-            ]
             self.console.print("[bold green]High-confidence suggestions[/bold green]")
-            self._handle_suggestions(high_confidence_suggestions, pre_selected=True)
+            self._handle_suggestions(suggestions, pre_selected=True)
 
-    def _handle_low_confidence_suggestions(self) -> None:
+    def _handle_low_confidence_suggestions(self, suggestions: list[Suggestion]) -> None:
         """Handle low-confidence suggestions."""
         if self.plan:
-            low_confidence_suggestions = [
-                s
-                for s in self.plan.pending_suggestions
-                if s.confidence is not None and s.confidence < AUTO_ACCEPT_CONFIDENCE
-            ]
             self.console.print("[bold yellow]Low-confidence suggestions[/bold yellow]")
-            self._handle_suggestions(low_confidence_suggestions, pre_selected=False)
+            self._handle_suggestions(suggestions, pre_selected=False)
+
+    @staticmethod
+    def _prompt_command(prompt: str) -> list[str]:
+        """Prompt for a command and split it into lowercase words."""
+        # split() already drops surrounding whitespace, so no strip() is needed
+        return Prompt.ask(prompt).lower().split()
 
     def _parse_id_or_range(self, id_or_range: str) -> tuple[int, int]:
         """Parse a single numerical ID or a range of IDs separated by a dash.
@@ -288,19 +274,26 @@ class CLI:
             end = start
         return start, end
 
-    def run_positions_view(self, positions: list[Position]) -> None:
+    def _selected_range(self, id_or_range: str, count: int) -> range:
+        """Parse an ID or range of IDs, clamped to the valid indices of a list of length count."""
+        start, end = self._parse_id_or_range(id_or_range)
+        return range(max(start, 0), min(end + 1, count))
+
+    def run_positions_view(self, positions: Iterable[Position]) -> None:
         """Public entry to interactive positions view."""
         self._positions_loop(positions)
 
-    def _positions_loop(self, positions: list[Position]) -> None:
+    def _positions_loop(self, positions: Iterable[Position]) -> None:
         """Interactive positions view: open a position to see transaction history."""
-        while True:
-            open_positions = [p for p in positions if not p.is_closed]
-            closed_positions = [p for p in positions if p.is_closed]
+        # Positions don't change while browsing, so partition them once
+        open_positions: list[Position] = []
+        closed_positions: list[Position] = []
+        for position in positions:
+            (closed_positions if position.is_closed else open_positions).append(position)
 
+        while True:
             self._display_positions_interactive(open_positions)
-            command = Prompt.ask("Enter command (o <id>=open, h=history, q=quit)")
-            parts = command.strip().lower().split()
+            parts = self._prompt_command("Enter command (o <id>=open, h=history, q=quit)")
             if not parts:
                 continue
             match parts:
@@ -334,12 +327,10 @@ class CLI:
         table.add_column("Realized Profit", style="green")
 
         for i, position in enumerate(positions):
-            status = "CLOSED" if position.is_closed else "OPEN"
-            realized = (
-                f"{position.realized_profit:.0f} {position.currency}"
-                if position.is_closed and position.realized_profit is not None
-                else "N/A"
-            )
+            # realized_profit is only set for closed positions
+            realized_profit = position.realized_profit
+            status = "OPEN" if realized_profit is None else "CLOSED"
+            realized = f"{realized_profit:.0f} {position.currency}" if realized_profit is not None else "N/A"
             table.add_row(
                 str(i),
                 status,
@@ -359,8 +350,7 @@ class CLI:
         """Interactive history view for closed positions."""
         while True:
             self._display_history_table(closed_positions)
-            command = Prompt.ask("Enter command (o <id>=open, b=back, q=quit)")
-            parts = command.strip().lower().split()
+            parts = self._prompt_command("Enter command (o <id>=open, b=back, q=quit)")
             if not parts:
                 continue
             match parts:
@@ -394,9 +384,8 @@ class CLI:
         table.add_column("Realized Profit", style="green")
 
         for i, position in enumerate(positions):
-            realized = (
-                f"{position.realized_profit:.0f} {position.currency}" if position.realized_profit is not None else "N/A"
-            )
+            realized_profit = position.realized_profit
+            realized = f"{realized_profit:.0f} {position.currency}" if realized_profit is not None else "N/A"
             table.add_row(
                 str(i),
                 position.symbol,
@@ -414,16 +403,8 @@ class CLI:
     def _show_transaction_history(self, position: Position) -> None:
         """Show transaction history and quick stats for a position."""
         # Quick stats
-        total_buys = sum(
-            t.total_amount
-            for t in position.transactions
-            if getattr(t.transaction_type, "value", str(t.transaction_type)) == "BUY"
-        )
-        total_sells = sum(
-            t.total_amount
-            for t in position.transactions
-            if getattr(t.transaction_type, "value", str(t.transaction_type)) == "SELL"
-        )
+        total_buys = position.total_bought
+        total_sells = position.total_sold
         realized = position.realized_profit
 
         stats = Table(title=f"{position.symbol} · Quick Stats", show_header=False)
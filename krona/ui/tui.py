@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 from textual import on
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
+from textual.coordinate import Coordinate
 from textual.widgets import Button, DataTable, Footer, Header, ProgressBar, Static, TabbedContent, TabPane
 
 if TYPE_CHECKING:
@@ -14,11 +15,14 @@ if TYPE_CHECKING:
     from krona.models.position import Position
     from krona.models.suggestion import Suggestion
 
+from krona.models.position import PortfolioSummary
 from krona.models.suggestion import SuggestionStatus
 from krona.ui.charts import PortfolioChart
 from krona.ui.views.transaction_history import TransactionModal
 from krona.utils.logger import logger
 
+STATUS_ICONS = {SuggestionStatus.ACCEPTED: "✓", SuggestionStatus.DECLINED: "✗", SuggestionStatus.PENDING: "○"}
+
 
 class KronaTUI(App):
     """Main Krona TUI application."""
@@ -40,6 +44,8 @@ class KronaTUI(App):
         self.positions = positions or []
         self.suggestions = plan.suggestions if plan else []
         self.wrapper = wrapper
+        # Number of accepted suggestions, kept up to date as suggestions are toggled
+        self.accepted_count = 0
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -56,12 +62,12 @@ class KronaTUI(App):
 
                 # Progress indicator
                 if self.suggestions:
-                    accepted = len([s for s in self.suggestions if s.status.value == "accepted"])
+                    self.accepted_count = self._count_accepted()
                     total = len(self.suggestions)
                     with Horizontal(classes="progress-container"):
-                        yield Static(f"Progress: {accepted}/{total}", classes="progress-label")
+                        yield Static(f"Progress: {self.accepted_count}/{total}", classes="progress-label")
                         progress = ProgressBar(total=total, show_eta=False)
-                        progress.advance(accepted)
+                        progress.advance(self.accepted_count)
                         yield progress
 
                 # Check if there are pending suggestions
@@ -150,6 +156,11 @@ class KronaTUI(App):
         table.clear()
         self._populate_suggestions_table(table)
 
+    def _refresh_status_column(self, table: DataTable) -> None:
+        """Refresh only the status cells of the suggestions table."""
+        for row, suggestion in enumerate(self.suggestions):
+            table.update_cell_at(Coordinate(row, 1), self._get_status_icon(suggestion))
+
     @on(DataTable.RowSelected, "#suggestions-table")
     def toggle_suggestion(self, event: DataTable.RowSelected) -> None:
         """Toggle suggestion status when row is selected."""
@@ -159,13 +170,13 @@ class KronaTUI(App):
                 suggestion = self.suggestions[idx]
                 if suggestion.status == SuggestionStatus.ACCEPTED:
                     suggestion.status = SuggestionStatus.DECLINED
+                    self.accepted_count -= 1
                 else:
                     suggestion.status = SuggestionStatus.ACCEPTED
-                self.suggestions[idx] = suggestion
-                self._refresh_suggestions_table(event.data_table)
-                self.update_progress_bar(
-                    len([s for s in self.suggestions if s.status.value == "accepted"]), len(self.suggestions)
-                )
+                    self.accepted_count += 1
+                # Only the status cell changes, so update it in place instead of rebuilding the table
+                event.data_table.update_cell_at(Coordinate(event.cursor_row, 1), self._get_status_icon(suggestion))
+                self.update_progress_bar(self.accepted_count, len(self.suggestions))
 
     @on(Button.Pressed, "#accept-all")
     def accept_all_suggestions(self) -> None:
@@ -173,8 +184,9 @@ class KronaTUI(App):
 
         for suggestion in self.suggestions:
             suggestion.status = SuggestionStatus.ACCEPTED
-        table = self.query_one(DataTable)
-        self._refresh_suggestions_table(table)
+        self.accepted_count = len(self.suggestions)
+        self._refresh_status_column(self.query_one(DataTable))
+        self.update_progress_bar(self.accepted_count, len(self.suggestions))
 
     @on(Button.Pressed, "#decline-all")
     def decline_all_suggestions(self) -> None:
@@ -182,8 +194,9 @@ class KronaTUI(App):
 
         for suggestion in self.suggestions:
             suggestion.status = SuggestionStatus.DECLINED
-        table = self.query_one(DataTable)
-        self._refresh_suggestions_table(table)
+        self.accepted_count = 0
+        self._refresh_status_column(self.query_one(DataTable))
+        self.update_progress_bar(self.accepted_count, len(self.suggestions))
 
     @on(Button.Pressed, "#finish")
     def finish_mappings(self) -> None:
@@ -211,27 +224,25 @@ class KronaTUI(App):
 
     def _get_status_icon(self, suggestion: Suggestion) -> str:
         """Get status icon for suggestion."""
-        if suggestion.status == SuggestionStatus.ACCEPTED:
-            return "✓"
-        elif suggestion.status == SuggestionStatus.DECLINED:
-            return "✗"
-        else:
-            return "○"
+        return STATUS_ICONS[suggestion.status]
+
+    def _count_accepted(self) -> int:
+        return sum(1 for s in self.suggestions if s.status == SuggestionStatus.ACCEPTED)
 
     def update_progress_bar(self, accepted: int, total: int) -> None:
         """Update the progress bar."""
-        progress_bar = self.query_one(ProgressBar)
-        progress_bar.advance(accepted)
+        for progress_bar in self.query(ProgressBar):
+            progress_bar.update(total=total, progress=accepted)
+        for label in self.query(".progress-label"):
+            if isinstance(label, Static):
+                label.update(f"Progress: {accepted}/{total}")
 
     def update_suggestions(self, suggestions: list[Suggestion]) -> None:
         """Update the suggestions in the mappings view."""
         self.suggestions = suggestions
-        table = self.query_one(DataTable)
-        table.clear()
-        self._populate_suggestions_table(table)
-        self.update_progress_bar(
-            len([s for s in self.suggestions if s.status.value == "accepted"]), len(self.suggestions)
-        )
+        self._refresh_suggestions_table(self.query_one(DataTable))
+        self.accepted_count = self._count_accepted()
+        self.update_progress_bar(self.accepted_count, len(self.suggestions))
 
     # General
 
@@ -262,11 +273,9 @@ class KronaTUI(App):
         for i, position in enumerate(positions):
             # Determine P&L display
             # Color code P&L
-            if position.realized_profit is not None:
-                if position.realized_profit > 0:
-                    pl_display = f"+{int(position.realized_profit)}"
-                else:
-                    pl_display = f"{int(position.realized_profit)}"
+            realized_profit = position.realized_profit
+            if realized_profit is not None:
+                pl_display = f"+{int(realized_profit)}" if realized_profit > 0 else f"{int(realized_profit)}"
             else:
                 pl_display = "N/A"
 
@@ -354,18 +363,14 @@ class KronaTUI(App):
     # Dashboard
     def update_stats(self, positions: list[Position]) -> None:
         """Update dashboard statistics."""
-        from textual.widgets import Static
-
         self.positions = positions
         stat_widgets: list[Static] = [w for w in self.query(".stat-value") if isinstance(w, Static)]
         if len(stat_widgets) >= 4:
-            stat_widgets[0].update(str(len([p for p in positions if not p.is_closed])))
-            total_value = sum(p.cost_basis for p in positions if not p.is_closed)
-            stat_widgets[1].update(f"{total_value:.2f}")
-            total_dividends = sum(p.dividends for p in positions)
-            stat_widgets[2].update(f"{total_dividends:.2f}")
-            closed_count = len([p for p in positions if p.is_closed])
-            stat_widgets[3].update(str(closed_count))
+            summary = PortfolioSummary.from_positions(positions)
+            stat_widgets[0].update(str(summary.open_positions))
+            stat_widgets[1].update(f"{summary.total_value:.2f}")
+            stat_widgets[2].update(f"{summary.total_dividends:.2f}")
+            stat_widgets[3].update(str(summary.closed_positions))
 
     # Transactions
     @on(Button.Pressed, "#back-to-positions")
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from krona.models.mapping import MappingPlan
+from krona.models.position import PortfolioSummary
 from krona.models.suggestion import Suggestion, SuggestionStatus
 from krona.models.transaction import Transaction
 from krona.processor.strategies.conflict_detection import ConflictDetectionStrategy
@@ -59,25 +60,20 @@ class TUIWrapper:
 
         # Convert mapping plan to suggestions if no suggestions exist
         if not self.plan.suggestions:
-            from krona.models.suggestion import Suggestion
-
             self.plan.suggestions = Suggestion.from_mapping_plan(self.plan)
 
         # If there are still no suggestions, create some from existing mappings for display
         if not self.plan.suggestions and self.plan.symbol_mappings:
-            from krona.models.suggestion import Suggestion, SuggestionStatus
-
             # Create suggestions from existing symbol mappings for display
-            for source, target in self.plan.symbol_mappings.items():
-                if source != target:  # Skip identical mappings
-                    suggestion = Suggestion(
-                        source_symbol=source,
-                        target_symbol=target,
-                        confidence=1.0,  # High confidence for existing mappings
-                        rationale="Existing mapping",
-                        status=SuggestionStatus.ACCEPTED,
-                    )
-                    self.plan.suggestions.append(suggestion)
+            for source, target in self.plan.non_identical_symbol_mappings.items():
+                suggestion = Suggestion(
+                    source_symbol=source,
+                    target_symbol=target,
+                    confidence=1.0,  # High confidence for existing mappings
+                    rationale="Existing mapping",
+                    status=SuggestionStatus.ACCEPTED,
+                )
+                self.plan.suggestions.append(suggestion)
 
         # Create the TUI app
         self.tui_app = KronaTUI(plan=self.plan, wrapper=self)
@@ -116,8 +112,7 @@ class TUIWrapper:
                 self.processor.mapper.accept_plan(self.plan)
 
                 self.processor.clear_positions()
-                for transaction in self.transactions:
-                    self.processor.add_transaction(transaction)
+                self.processor.add_transactions(self.transactions)
 
                 # Get positions to display
                 positions = list(self.processor.positions.values())
@@ -140,12 +135,13 @@ class TUIWrapper:
                 self.tui_app.switch_tab("positions")
             except Exception:
                 # TUI is no longer running, just print a summary
-                print("\n📊 Portfolio Summary:")
-                print(f"Total Positions: {len(positions)}")
-                total_value = sum(p.cost_basis for p in positions if not p.is_closed)
-                print(f"Total Value: {total_value:.2f}")
-                total_dividends = sum(p.dividends for p in positions)
-                print(f"Total Dividends: {total_dividends:.2f}")
+                summary = PortfolioSummary.from_positions(positions)
+                print(
+                    "\n📊 Portfolio Summary:\n"
+                    f"Total Positions: {len(positions)}\n"
+                    f"Total Value: {summary.total_value:.2f}\n"
+                    f"Total Dividends: {summary.total_dividends:.2f}"
+                )
 
     def _handle_high_confidence_suggestions(self) -> None:
         """Handle high-confidence suggestions by auto-accepting them."""
@@ -62,8 +62,8 @@ class TransactionModal(ModalScreen[None]):
             )
 
     def _render_quick_stats(self) -> str:
-        total_buys = sum(t.total_amount for t in self.position.transactions if t.transaction_type.value == "BUY")
-        total_sells = sum(t.total_amount for t in self.position.transactions if t.transaction_type.value == "SELL")
+        total_buys = self.position.total_bought
+        total_sells = self.position.total_sold
         dividends = self.position.dividends
         fees = self.position.fees
         realized = self.position.realized_profit
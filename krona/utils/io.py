@@ -1,9 +1,16 @@
+import hashlib
+import json
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
 from pathlib import Path
 from typing import Any
 
 import yaml
 
 from krona.models.mapping import MappingPlan, SymbolGroup
+from krona.models.suggestion import Suggestion
 from krona.models.transaction import Transaction
 from krona.parsers.base import BaseParser
 
@@ -26,12 +33,33 @@ DEFAULT_CONFIG = {
 }
 
 
+# Upper bound on the number of broker files parsed concurrently
+MAX_PARSE_WORKERS = 8
+
+# Use the libyaml bindings when PyYAML was built with them; both load and dump plain data the same way
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _represent_symbol_group(dumper: yaml.SafeDumper, group: SymbolGroup) -> yaml.Node:
+    """Represent a SymbolGroup as its mappings.yml entry."""
+    return dumper.represent_dict(group.to_dict())
+
+
+class _KronaDumper(YAML_DUMPER):
+    """YAML_DUMPER with krona's representers, registered here instead of on the library's dumper."""
+
+
+# Lets symbol groups be dumped as they are, without first copying them into a dict of dicts
+_KronaDumper.add_representer(SymbolGroup, _represent_symbol_group)
+
+
 def get_config() -> dict[str, Any]:
     """Return the default configuration."""
     return DEFAULT_CONFIG
 
 
-def identify_broker_files(path: Path, parsers: list[BaseParser]) -> dict[str, list[str]]:
+def identify_broker_files(path: Path, parsers: Sequence[BaseParser]) -> dict[str, list[str]]:
     """
     Identify exported transaction files from all brokers in a given directory.
     Returns a dictionary with the broker name as the key and a list of file names as the value.
@@ -48,23 +76,96 @@ def identify_broker_files(path: Path, parsers: list[BaseParser]) -> dict[str, li
     return files
 
 
-def read_transactions_from_files(broker_files: dict[str, list[str]], parsers: list[BaseParser]) -> list[Transaction]:
+def _parse_file(parser: BaseParser, file: str) -> list[Transaction]:
+    return list(parser.parse_file(file))
+
+
+def iter_transactions_from_files(
+    broker_files: dict[str, list[str]], parsers: Sequence[BaseParser]
+) -> Iterator[Transaction]:
+    """
+    Parse the broker files concurrently and yield their transactions in file order.
+    Polars releases the GIL while reading CSV files, so files are parsed on a thread pool. Results are
+    yielded in submission order so that the subsequent (stable) sort is deterministic.
+    """
+    jobs = [(parser, file) for parser in parsers for file in broker_files[parser.name]]
+    if not jobs:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(jobs))) as executor:
+        futures = [executor.submit(_parse_file, parser, file) for parser, file in jobs]
+        for future in futures:
+            yield from future.result()
+
+
+def _sort_transactions(transactions: Iterable[Transaction]) -> list[Transaction]:
+    """
+    Sort transactions by date, and then by transaction type.
+    This ensures that BUY transactions are processed before SELL transactions on the same day.
+    """
+    return sorted(transactions, key=lambda x: (x.date, x.transaction_type.value != "BUY"))
+
+
+def read_transactions_from_files(
+    broker_files: dict[str, list[str]], parsers: Sequence[BaseParser]
+) -> list[Transaction]:
     """
     Parse the broker files and return a sorted list of transactions.
     Transactions are sorted by date, and then by transaction type. This ensures that BUY transactions are processed before SELL transactions on the same day.
     """
-    transactions: list[Transaction] = []
+    return _sort_transactions(iter_transactions_from_files(broker_files, parsers))
 
-    for parser in parsers:
-        for file in broker_files[parser.name]:
-            for transaction in parser.parse_file(file):
-                transactions.append(transaction)
 
-    return sorted(transactions, key=lambda x: (x.date, x.transaction_type.value != "BUY"))
+def _identify_and_parse_file(file: str, parsers: Sequence[BaseParser]) -> tuple[int, list[Transaction]] | None:
+    """Parse a file with the first parser that accepts it, returning that parser's index and the transactions."""
+    for index, parser in enumerate(parsers):
+        if parser.is_valid_file(file):
+            return index, list(parser.parse_file(file))
+    return None
+
+
+def read_broker_transactions(path: Path, parsers: Sequence[BaseParser]) -> list[Transaction]:
+    """
+    Identify and parse the exported transaction files in a directory in a single pass, returning a sorted list.
+    Each file is handled by one job that picks its parser and parses it, instead of identifying all files before
+    parsing any. Transactions are ordered as read_transactions_from_files(identify_broker_files(...)) orders them.
+    """
+    files = [str(file) for file in path.iterdir() if file.name.endswith(".csv")]
+    # Parsed files grouped by parser, in directory order, to keep the sort input order stable
+    parsed: list[list[list[Transaction]]] = [[] for _ in parsers]
+    if files:
+        with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(files))) as executor:
+            for result in executor.map(_identify_and_parse_file, files, repeat(parsers)):
+                if result is not None:
+                    index, transactions = result
+                    parsed[index].append(transactions)
+
+    return _sort_transactions(chain.from_iterable(chain.from_iterable(parsed)))
 
 
 DEFAULT_MAPPING_CONFIG_FILE = "mappings.yml"
 
+# Mapping config path -> (mtime, size) and the YAML parsed from it
+_mapping_config_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _read_mapping_yaml(config_path: Path) -> Any:
+    """Parse a mapping config file, reusing the last result while its mtime and size are unchanged.
+
+    The UI and the mapper both load the mapping config during a run; the parsed data is shared, so it must not
+    be mutated.
+    """
+    stat = config_path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _mapping_config_cache.get(config_path)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    with open(config_path) as f:
+        yaml_data = yaml.load(f, Loader=YAML_LOADER)  # noqa: S506
+    _mapping_config_cache[config_path] = (version, yaml_data)
+    return yaml_data
+
 
 def save_mapping_config(plan: MappingPlan, config_file: str = DEFAULT_MAPPING_CONFIG_FILE) -> bool:
     """Save the mapping configuration to a YAML file.
@@ -84,29 +185,30 @@ def save_mapping_config(plan: MappingPlan, config_file: str = DEFAULT_MAPPING_CO
         for source_symbol, target_symbol in final_mappings.items():
             if target_symbol not in symbol_groups:
                 symbol_groups[target_symbol] = SymbolGroup(canonical_symbol=target_symbol)
-            symbol_groups[target_symbol].synonyms.append(source_symbol)
+            symbol_groups[target_symbol].synonyms.add(source_symbol)
 
         # Add ISIN mappings
         for isin, canonical_symbol in plan.isin_mappings.items():
             if canonical_symbol not in symbol_groups:
                 symbol_groups[canonical_symbol] = SymbolGroup(canonical_symbol=canonical_symbol)
-            symbol_groups[canonical_symbol].isins.append(isin)
-
-        # Convert to YAML format
-        yaml_data = {}
-        for canonical_symbol, group in symbol_groups.items():
-            yaml_data[canonical_symbol] = group.to_dict()
+            symbol_groups[canonical_symbol].isins.add(isin)
 
         # Save to file
         config_path = Path(config_file)
+        _mapping_config_cache.pop(config_path, None)
         with open(config_path, "w") as f:
-            yaml.dump(yaml_data, f, default_flow_style=False, sort_keys=True)
+            yaml.dump(symbol_groups, f, Dumper=_KronaDumper, default_flow_style=False, sort_keys=True)
 
         return True
     except Exception:
         return False
 
 
+def _intern(value: Any) -> Any:
+    """Intern YAML strings so they share the objects the parsers interned for the same symbols and ISINs."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 def load_mapping_config(config_file: str = DEFAULT_MAPPING_CONFIG_FILE) -> MappingPlan | None:
     """Load the mapping configuration from a YAML file."""
     config_path = Path(config_file)
@@ -115,8 +217,7 @@ def load_mapping_config(config_file: str = DEFAULT_MAPPING_CONFIG_FILE) -> Mappi
         return None
 
     try:
-        with open(config_path) as f:
-            yaml_data = yaml.safe_load(f)
+        yaml_data = _read_mapping_yaml(config_path)
 
         if not yaml_data:
             return None
@@ -126,17 +227,74 @@ def load_mapping_config(config_file: str = DEFAULT_MAPPING_CONFIG_FILE) -> Mappi
 
         # Parse the YAML data
         for canonical_symbol, group_data in yaml_data.items():
+            canonical_symbol = _intern(canonical_symbol)
             group = SymbolGroup.from_dict(canonical_symbol, group_data)
 
             # Add synonyms to symbol mappings
             for synonym in group.synonyms:
-                symbol_mappings[synonym] = canonical_symbol
+                symbol_mappings[_intern(synonym)] = canonical_symbol
 
             # Add ISINs to ISIN mappings
             for isin in group.isins:
-                isin_mappings[isin] = canonical_symbol
+                isin_mappings[_intern(isin)] = canonical_symbol
 
         return MappingPlan(symbol_mappings=symbol_mappings, isin_mappings=isin_mappings, suggestions=[])
 
     except (yaml.YAMLError, KeyError, ValueError):
         return None
+
+
+DEFAULT_PLAN_CACHE_FILE = ".krona_plan_cache.yml"
+# Part of every plan signature. Bump it whenever the suggestion strategies or the Suggestion.to_dict layout
+# change, so plans cached by an older krona are regenerated
+PLAN_CACHE_VERSION = 1
+
+
+def plan_signature(*inputs: Any) -> str:
+    """Return a stable hash of the inputs a mapping plan is derived from, and of the plan cache version."""
+    payload = json.dumps([PLAN_CACHE_VERSION, inputs], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def save_cached_plan(signature: str, plan: MappingPlan, cache_file: str = DEFAULT_PLAN_CACHE_FILE) -> bool:
+    """Save a generated mapping plan together with the signature of its inputs.
+
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    try:
+        yaml_data = {
+            "signature": signature,
+            "symbol_mappings": plan.symbol_mappings,
+            "isin_mappings": plan.isin_mappings,
+            "suggestions": [suggestion.to_dict() for suggestion in plan.suggestions],
+        }
+        with open(Path(cache_file), "w") as f:
+            yaml.dump(yaml_data, f, Dumper=_KronaDumper, default_flow_style=False, sort_keys=False)
+        return True
+    except Exception:
+        return False
+
+
+def load_cached_plan(signature: str, cache_file: str = DEFAULT_PLAN_CACHE_FILE) -> MappingPlan | None:
+    """Load a cached mapping plan, if one was saved for inputs with the same signature."""
+    cache_path = Path(cache_file)
+
+    if not cache_path.exists():
+        return None
+
+    try:
+        with open(cache_path) as f:
+            yaml_data = yaml.load(f, Loader=YAML_LOADER)  # noqa: S506
+
+        if not yaml_data or yaml_data.get("signature") != signature:
+            return None
+
+        return MappingPlan(
+            symbol_mappings=yaml_data.get("symbol_mappings") or {},
+            isin_mappings=yaml_data.get("isin_mappings") or {},
+            suggestions=[Suggestion.from_dict(data) for data in yaml_data.get("suggestions") or []],
+        )
+
+    except (yaml.YAMLError, AttributeError, KeyError, ValueError):
+        return None
@@ -1,6 +1,24 @@
+from krona.models.transaction import TransactionType
 from krona.parsers.avanza import AvanzaParser
 
 
 def test_avanza_parser(avanza_file: str, avanza_parser: AvanzaParser):
     for _ in avanza_parser.parse_file(avanza_file):
         pass
+
+
+def test_avanza_parser_books_positive_sell_as_buy(tmp_path, avanza_parser: AvanzaParser):
+    csv_file = tmp_path / "avanza.csv"
+    csv_file.write_text(
+        "Datum;Konto;Typ av transaktion;Värdepapper/beskrivning;Antal;Kurs;Belopp;Transaktionsvaluta;"
+        "Courtage (SEK);Valutakurs;Instrumentvaluta;ISIN;Resultat\n"
+        "2024-02-26;KF;Sälj;Bahnhof B;-26;41,2;1068;SEK;3;;SEK;SE0010442418;\n"
+        "2024-02-27;KF;Sälj;Bahnhof B;26;41,2;-1068;SEK;-3;;SEK;SE0010442418;\n"
+        "2024-02-28;KF;Ränta;Bahnhof B;1;1;1;SEK;;;SEK;SE0010442418;\n",
+        encoding="utf-8",
+    )
+
+    transactions = list(avanza_parser.parse_file(str(csv_file)))
+
+    assert [t.transaction_type for t in transactions] == [TransactionType.SELL, TransactionType.BUY]
+    assert [(t.quantity, t.price, t.fees) for t in transactions] == [(26, 41.2, 3), (26, 41.2, 3)]
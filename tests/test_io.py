@@ -0,0 +1,61 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+from krona.models.mapping import MappingPlan, SymbolGroup
+from krona.parsers.avanza import AvanzaParser
+from krona.parsers.nordnet import NordnetParser
+from krona.utils.io import (
+    PLAN_CACHE_VERSION,
+    YAML_DUMPER,
+    identify_broker_files,
+    load_mapping_config,
+    plan_signature,
+    read_broker_transactions,
+    read_transactions_from_files,
+    save_mapping_config,
+)
+
+
+def test_read_broker_transactions_matches_two_pass_read(tmp_path: Path, nordnet_file: str):
+    shutil.copy(nordnet_file, tmp_path / "nordnet.csv")
+    (tmp_path / "notes.txt").write_text("not a broker export")
+    parsers = (NordnetParser(), AvanzaParser())
+
+    transactions = read_broker_transactions(tmp_path, parsers)
+
+    expected = read_transactions_from_files(identify_broker_files(tmp_path, parsers), parsers)
+    assert len(transactions) > 0
+    assert transactions == expected
+
+
+def test_load_mapping_config_rereads_changed_file(tmp_path: Path):
+    config_file = str(tmp_path / "mappings.yml")
+    plan = MappingPlan(symbol_mappings={"AAPL": "Apple"}, isin_mappings={"US0378331005": "Apple"}, suggestions=[])
+    assert save_mapping_config(plan, config_file)
+
+    loaded = load_mapping_config(config_file)
+    assert loaded is not None
+    assert loaded.symbol_mappings == {"AAPL": "Apple"}
+    assert load_mapping_config(config_file) == loaded
+
+    plan.symbol_mappings["APPLE INC"] = "Apple"
+    assert save_mapping_config(plan, config_file)
+    reloaded = load_mapping_config(config_file)
+    assert reloaded is not None
+    assert reloaded.symbol_mappings["APPLE INC"] == "Apple"
+
+
+def test_plan_signature_changes_with_cache_version(monkeypatch):
+    signature = plan_signature([("AAPL", ["US0378331005"])], {})
+    assert plan_signature([("AAPL", ["US0378331005"])], {}) == signature
+
+    monkeypatch.setattr("krona.utils.io.PLAN_CACHE_VERSION", PLAN_CACHE_VERSION + 1)
+    assert plan_signature([("AAPL", ["US0378331005"])], {}) != signature
+
+
+def test_symbol_group_representer_is_not_registered_on_the_library_dumper():
+    with pytest.raises(yaml.representer.RepresenterError):
+        yaml.dump(SymbolGroup(canonical_symbol="Apple"), Dumper=YAML_DUMPER)
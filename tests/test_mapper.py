@@ -1,7 +1,7 @@
 from datetime import date
 from unittest.mock import MagicMock, patch
 
-from krona.models.mapping import MappingPlan
+from krona.models.mapping import MappingPlan, SymbolGroup
 from krona.models.transaction import Transaction, TransactionType
 from krona.processor.mapper import Mapper
 
@@ -40,3 +40,131 @@ def test_create_mapping_plan():
         assert isinstance(plan, MappingPlan)
         mock_fuzzy_instance.execute.assert_called_once()
         mock_conflict_instance.execute.assert_called_once()
+
+
+def test_create_mapping_plan_reuses_cached_plan(tmp_path):
+    cache_file = str(tmp_path / "plan_cache.yml")
+    transactions = [
+        Transaction(
+            date=date(2023, 1, 1),
+            transaction_type=TransactionType.BUY,
+            symbol=symbol,
+            ISIN="US0231351067",
+            quantity=1,
+            price=1,
+            fees=0,
+            currency="USD",
+        )
+        for symbol in ("AMAZON.COM", "AMAZON.COM INC")
+    ]
+    plan = Mapper().create_mapping_plan(transactions, cache_file=cache_file)
+    assert plan.suggestions
+
+    with patch("krona.processor.mapper.FuzzyMatchStrategy") as mock_fuzzy_strategy:
+        cached_plan = Mapper().create_mapping_plan(transactions, cache_file=cache_file)
+
+    mock_fuzzy_strategy.assert_not_called()
+    assert cached_plan == plan
+
+    # A new symbol invalidates the cached plan
+    transactions[0].symbol = "AMAZON"
+    with patch("krona.processor.mapper.FuzzyMatchStrategy") as mock_fuzzy_strategy:
+        Mapper().create_mapping_plan(transactions, cache_file=cache_file)
+
+    mock_fuzzy_strategy.assert_called_once()
+
+
+def test_consolidate_symbol_groups_merges_chained_groups():
+    mapper = Mapper()
+    mapper._convert_mappings_to_groups(
+        {"ALPHA": "Alpha Inc", "Alpha Inc": "Alpha Incorporated"},
+        {"US0000000001": "Alpha Inc"},
+    )
+
+    assert list(mapper._symbol_groups) == ["Alpha Incorporated"]
+    group = mapper._symbol_groups["Alpha Incorporated"]
+    assert group.synonyms == {"ALPHA", "Alpha Inc"}
+    assert group.isins == {"US0000000001"}
+    assert group.to_dict() == {"synonyms": ["ALPHA", "Alpha Inc"], "ISINs": ["US0000000001"]}
+    assert SymbolGroup.from_dict("Alpha Incorporated", group.to_dict()) == group
+
+
+def test_canonical_symbol_from_position_follows_group_changes():
+    mapper = Mapper()
+    mapper._convert_mappings_to_groups({"ALPHA": "Alpha Inc", "Alpha Inc": "Alpha Incorporated"}, {})
+    mapper._symbol_mappings = {}
+
+    assert mapper._get_canonical_symbol_from_position("ALPHA") == "Alpha Incorporated"
+    assert mapper._get_canonical_symbol_from_position("BETA") is None
+
+    mapper.add_mapping("Beta Corp", ["BETA"])
+    mapper._symbol_mappings = {}
+    assert mapper._get_canonical_symbol_from_position("BETA") == "Beta Corp"
+
+
+def test_canonical_symbol_is_resolved_again_after_accepting_a_plan():
+    mapper = Mapper()
+    transaction = Transaction(
+        date=date(2023, 1, 1),
+        transaction_type=TransactionType.BUY,
+        symbol="AMAZON.COM",
+        ISIN="US0231351067",
+        quantity=1,
+        price=1,
+        fees=0,
+        currency="USD",
+    )
+    assert mapper._get_canonical_symbol(transaction) == "AMAZON.COM"
+
+    mapper.accept_plan(MappingPlan(symbol_mappings={"AMAZON.COM": "AMAZON.COM INC"}, isin_mappings={}, suggestions=[]))
+    assert mapper._get_canonical_symbol(transaction) == "AMAZON.COM INC"
+
+
+def test_cached_canonical_symbol_follows_an_accepted_plan():
+    mapper = Mapper()
+    transaction = Transaction(
+        date=date(2023, 1, 1),
+        transaction_type=TransactionType.BUY,
+        symbol="Volvo B",
+        ISIN="SE0000115446",
+        quantity=1,
+        price=1,
+        fees=0,
+        currency="SEK",
+    )
+    mapper.match_transaction_to_position(transaction, {})
+    assert transaction.canonical_symbol == "Volvo B"
+
+    mapper.accept_plan(MappingPlan(symbol_mappings={"Volvo B": "Ericsson"}, isin_mappings={}, suggestions=[]))
+    mapper.match_transaction_to_position(transaction, {})
+    assert transaction.canonical_symbol == "Ericsson"
+
+
+def test_resolved_symbols_follow_chains_and_stop_at_cycles():
+    mapper = Mapper()
+    mapper._symbol_mappings = {"A": "B", "B": "C", "X": "Y", "Y": "Z", "Z": "Y"}
+
+    assert mapper._get_resolved_symbols() == {"A": "C", "B": "C", "X": "Y", "Y": "Y", "Z": "Z"}
+
+
+def test_consolidate_symbol_groups_merges_groups_linked_in_either_direction():
+    mapper = Mapper()
+    mapper._convert_mappings_to_groups(
+        {"ALPHA": "Alpha", "AI": "Alpha Holdings Inc", "Alpha": "Alpha Inc", "Alpha Inc": "Alpha Holdings Inc"},
+        {"US0000000001": "Alpha"},
+    )
+
+    assert list(mapper._symbol_groups) == ["Alpha Holdings Inc"]
+    group = mapper._symbol_groups["Alpha Holdings Inc"]
+    assert group.synonyms == {"ALPHA", "AI", "Alpha", "Alpha Inc"}
+    assert group.isins == {"US0000000001"}
+
+
+def test_save_mappings_writes_symbol_groups(tmp_path):
+    mapper = Mapper()
+    mapper.add_mapping("Apple", ["AAPL", "APPLE INC"], isin="US0378331005")
+    path = tmp_path / "mappings.yml"
+
+    mapper.save_mappings(path)
+
+    assert path.read_text() == "Apple:\n  ISINs:\n  - US0378331005\n  synonyms:\n  - AAPL\n  - APPLE INC\n"
@@ -4,3 +4,40 @@ from krona.parsers.nordnet import NordnetParser
 def test_nordnet_parser(nordnet_file: str, nordnet_parser: NordnetParser):
     for _ in nordnet_parser.parse_file(nordnet_file):
         pass
+
+
+def test_nordnet_parser_strips_old_suffix(nordnet_file: str, nordnet_parser: NordnetParser):
+    symbols = {transaction.symbol for transaction in nordnet_parser.parse_file(nordnet_file)}
+    assert "BAHN B" in symbols
+    assert not any(".OLD" in symbol for symbol in symbols)
+
+
+def test_nordnet_parser_rejects_avanza_file(avanza_file: str, nordnet_parser: NordnetParser):
+    assert not nordnet_parser.is_valid_file(avanza_file)
+    assert list(nordnet_parser.parse_file(avanza_file)) == []
+
+
+def test_nordnet_parser_requires_utf16_bom(tmp_path, nordnet_file: str, nordnet_parser: NordnetParser):
+    without_bom = tmp_path / "nordnet.csv"
+    with open(nordnet_file, encoding="utf-16") as f:
+        without_bom.write_bytes(f.read().encode("utf-16-le"))
+
+    assert nordnet_parser.is_valid_file(nordnet_file)
+    assert not nordnet_parser.is_valid_file(str(without_bom))
+
+
+def test_nordnet_parser_skips_row_with_malformed_price(tmp_path, nordnet_file: str, nordnet_parser: NordnetParser):
+    with open(nordnet_file, encoding="utf-16") as f:
+        lines = f.read().split("\n")
+    header = lines[0].split("\t")
+    row = lines[1].split("\t")
+    row[header.index("Kurs")] = "1 234,5"
+    lines[1] = "\t".join(row)
+    malformed = tmp_path / "nordnet.csv"
+    malformed.write_text("\n".join(lines), encoding="utf-16")
+
+    expected = list(nordnet_parser.parse_file(nordnet_file))
+    transactions = list(nordnet_parser.parse_file(str(malformed)))
+
+    assert len(transactions) == len(expected) - 1
+    assert all(transaction.price != 1234.5 for transaction in transactions)
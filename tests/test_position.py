@@ -2,7 +2,7 @@ from datetime import date
 
 from pytest import approx
 
-from krona.models.position import Position
+from krona.models.position import PortfolioSummary, Position
 from krona.models.transaction import Transaction, TransactionType
 from krona.processor.position import apply_transaction
 
@@ -133,7 +133,7 @@ def test_position_apply_split_transaction():
     )
     position = apply_transaction(position, split1)
 
-    assert len(position.transaction_buffer) == 1
+    assert position.pending_split is not None
 
     split2 = Transaction(
         date=date(2017, 10, 17),
@@ -149,4 +149,81 @@ def test_position_apply_split_transaction():
 
     assert position.quantity == 230
     assert position.price == approx(214.5 / 10)
-    assert len(position.transaction_buffer) == 0
+    assert position.pending_split is None
+
+
+def test_portfolio_summary_from_positions():
+    open_position, closed_position = (
+        Position(
+            symbol=symbol,
+            ISIN=isin,
+            currency="SEK",
+            quantity=quantity,
+            price=100,
+            dividends=dividends,
+            fees=0,
+            transactions=[],
+        )
+        for symbol, isin, quantity, dividends in (("A", "SE0000000001", 10, 5), ("B", "SE0000000002", 0, 7))
+    )
+
+    summary = PortfolioSummary.from_positions([open_position, closed_position])
+
+    assert summary.open_positions == 1
+    assert summary.closed_positions == 1
+    assert summary.total_value == 1000
+    assert summary.total_dividends == 12
+
+
+def test_position_realized_profit_from_running_totals():
+    buy = Transaction(
+        date=date(2023, 1, 1),
+        transaction_type=TransactionType.BUY,
+        symbol="AAPL",
+        ISIN="US0378331005",
+        quantity=10,
+        price=150,
+        fees=10,
+        currency="USD",
+    )
+    sell = Transaction(
+        date=date(2023, 2, 1),
+        transaction_type=TransactionType.SELL,
+        symbol="AAPL",
+        ISIN="US0378331005",
+        quantity=10,
+        price=170,
+        fees=5,
+        currency="USD",
+    )
+    position = Position.new(buy)
+    position = apply_transaction(position, buy)
+    assert position.realized_profit is None
+
+    position = apply_transaction(position, sell)
+
+    assert position.total_bought == approx(1510)
+    assert position.total_sold == approx(1705)
+    assert position.realized_profit == approx(1705 - 1510 - 15)
+
+
+def test_position_split_without_buys_keeps_float_price():
+    legs = [
+        Transaction(
+            date=date(2017, 10, 17),
+            transaction_type=TransactionType.SPLIT,
+            symbol="BAHN B",
+            ISIN=isin,
+            quantity=quantity,
+            price=0,
+            fees=0,
+            currency="SEK",
+        )
+        for isin, quantity in (("SE0002252296", 23), ("SE0010442418", 230))
+    ]
+    position = Position.new(legs[0])
+    for leg in legs:
+        position = apply_transaction(position, leg)
+
+    assert isinstance(position.price, float)
+    assert "BAHN B" in str(position)
@@ -1,6 +1,7 @@
 from datetime import date
 
 from krona.models.mapping import MappingPlan
+from krona.models.suggestion import SuggestionKind
 from krona.models.transaction import Transaction, TransactionType
 from krona.processor.strategies.conflict_detection import (
     ConflictDetectionStrategy,
@@ -85,6 +86,46 @@ def test_fuzzy_match_strategy_corporate_action():
     assert "isin change" in plan.suggestions[0].rationale.lower()
 
 
+def test_fuzzy_match_strategy_isin_change_date():
+    strategy = FuzzyMatchStrategy()
+    plan = MappingPlan(
+        symbol_mappings={},
+        isin_mappings={},
+        suggestions=[],
+    )
+    symbol_to_isins = {
+        "SAMPO PLC A": {"FI0009003305"},
+        "SAMPO AB": {"FI0009003306"},
+    }
+    isin_to_symbols = {
+        "FI0009003305": {"SAMPO PLC A"},
+        "FI0009003306": {"SAMPO AB"},
+    }
+    transactions = [
+        Transaction(
+            date=d,
+            transaction_type=TransactionType.BUY,
+            symbol="SAMPO AB",
+            ISIN="FI0009003306",
+            quantity=1,
+            price=1,
+            fees=0,
+            currency="EUR",
+        )
+        for d in (date(2024, 3, 1), date(2023, 6, 15))
+    ]
+
+    strategy.execute(
+        plan=plan,
+        symbol_to_isins=symbol_to_isins,
+        isin_to_symbols=isin_to_symbols,
+        transactions=transactions,
+    )
+
+    assert plan.suggestions[0].rationale == "ISIN change on 2023-06-15"
+    assert plan.suggestions[0].kind == SuggestionKind.ISIN_CHANGE
+
+
 def test_fuzzy_match_strategy_acronym():
     strategy = FuzzyMatchStrategy()
     plan = MappingPlan(
@@ -103,3 +103,157 @@ def test_find_or_create_position_new():
     assert position is not None
     assert position.ISIN == "US0378331005"
     assert position.quantity == 0  # Position is new
+
+
+def test_add_transactions_matches_sequential_processing():
+    transactions = [
+        Transaction(
+            date=date(2023, 1, 1),
+            transaction_type=TransactionType.BUY,
+            symbol="AAPL",
+            ISIN="US0378331005",
+            quantity=10,
+            price=150,
+            fees=10,
+            currency="USD",
+        ),
+        Transaction(
+            date=date(2023, 1, 2),
+            transaction_type=TransactionType.BUY,
+            symbol="MSFT",
+            ISIN="US5949181045",
+            quantity=5,
+            price=300,
+            fees=5,
+            currency="USD",
+        ),
+        Transaction(
+            date=date(2023, 1, 3),
+            transaction_type=TransactionType.SELL,
+            symbol="AAPL",
+            ISIN="US0378331005",
+            quantity=4,
+            price=160,
+            fees=5,
+            currency="USD",
+        ),
+    ]
+    processor = TransactionProcessor()
+    processor.add_transactions(transactions)
+
+    assert list(processor.positions) == ["AAPL", "MSFT"]
+    assert processor.positions["AAPL"].quantity == 6
+    assert processor.positions["MSFT"].quantity == 5
+    assert len(processor.history["AAPL"]) == 2
+
+
+def test_clear_positions_resets_cached_canonical_symbol():
+    processor = TransactionProcessor()
+    processor.mapper.add_mapping("Apple", ["AAPL"])
+    transaction = Transaction(
+        date=date(2023, 1, 1),
+        transaction_type=TransactionType.BUY,
+        symbol="AAPL",
+        ISIN="US0378331005",
+        quantity=10,
+        price=150,
+        fees=10,
+        currency="USD",
+    )
+    processor.add_transaction(transaction)
+    assert transaction.canonical_symbol == "Apple"
+
+    processor.clear_positions()
+    assert transaction.canonical_symbol is None
+
+
+def test_add_transactions_renames_positions_to_canonical_symbol():
+    processor = TransactionProcessor()
+    processor.mapper.add_mapping("Apple", ["AAPL"])
+    processor.positions["AAPL"] = Position.new(
+        Transaction(
+            date=date(2023, 1, 1),
+            transaction_type=TransactionType.BUY,
+            symbol="AAPL",
+            ISIN="US0378331005",
+            quantity=10,
+            price=150,
+            fees=10,
+            currency="USD",
+        )
+    )
+    processor.add_transactions(
+        [
+            Transaction(
+                date=date(2023, 1, 2),
+                transaction_type=TransactionType.BUY,
+                symbol="MSFT",
+                ISIN="US5949181045",
+                quantity=5,
+                price=250,
+                fees=5,
+                currency="USD",
+            )
+        ]
+    )
+
+    assert list(processor.positions) == ["MSFT", "Apple"]
+    assert processor.positions["Apple"].symbol == "Apple"
+
+
+def test_add_transactions_matches_positions_created_earlier_in_the_batch():
+    processor = TransactionProcessor()
+    processor.add_transactions(
+        [
+            Transaction(
+                date=date(2023, 1, day),
+                transaction_type=TransactionType.BUY,
+                symbol=symbol,
+                ISIN=isin,
+                quantity=1,
+                price=100,
+                fees=0,
+                currency="USD",
+            )
+            for day, symbol, isin in [
+                (1, "Apple", "US0378331005"),
+                (2, "Microsoft", "US5949181045"),
+                (3, "APPLE", "US0378331005"),
+                (4, "MSFT", "US5949181045"),
+            ]
+        ]
+    )
+
+    assert list(processor.positions) == ["Apple", "Microsoft"]
+    assert processor.positions["Apple"].quantity == 2
+    assert processor.positions["Microsoft"].quantity == 2
+
+
+def test_add_transactions_finds_replaced_position_by_its_new_isin():
+    processor = TransactionProcessor()
+    processor.mapper.add_mapping("BAHN B", [], isin="SE0010442418")
+    processor.add_transactions(
+        [
+            Transaction(
+                date=date(2023, 1, day),
+                transaction_type=TransactionType.BUY,
+                symbol=symbol,
+                ISIN=isin,
+                quantity=quantity,
+                price=100,
+                fees=0,
+                currency="SEK",
+            )
+            for day, symbol, isin, quantity in [
+                (1, "APPLE", "US0378331005", 1),
+                (2, "Volvo B", "SE0000115446", 2),
+                # Not matched through its mapped ISIN, so a new position replaces the one stored under APPLE
+                (3, "APPLE", "SE0010442418", 3),
+                (4, "Volvo B", "SE0010442418", 4),
+            ]
+        ]
+    )
+
+    assert processor.positions["APPLE"].ISIN == "SE0010442418"
+    assert processor.positions["APPLE"].quantity == 7
+    assert processor.positions["Volvo B"].quantity == 2